@@ -0,0 +1,110 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from typing import Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".speechease", "cache", "audio")
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+class AudioCache:
+    """Size-bounded LRU cache of rendered audio, one WAV file per text chunk.
+
+    Keys hash the chunk text together with the voice, rate and volume it was
+    rendered with, so changing any engine parameter simply misses. Files live
+    in cache_dir; a small SQLite table tracks their sizes and last use so the
+    least recently played chunks are deleted once max_bytes is exceeded.
+    The cache is safe to share between processes (playback and export).
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(cache_dir, "audio_cache.db")
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, nbytes INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(text: str, voice: str, rate: float, volume: float) -> str:
+        params = json.dumps([text, voice, round(rate, 2), round(volume, 2)])
+        return hashlib.sha256(params.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file for key, or None on a miss"""
+        path = self._path(key)
+        with self._connect() as conn:
+            updated = conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            ).rowcount
+        if updated and os.path.exists(path):
+            return path
+        return None
+
+    def put(self, key: str, source_path: str) -> str:
+        """Copy a rendered file into the cache and return its cached path"""
+        path = self._path(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, nbytes, last_access) VALUES (?, ?, ?)",
+                (key, os.path.getsize(path), time.time()),
+            )
+            self._evict(conn, keep=key)
+        return path
+
+    def _evict(self, conn: sqlite3.Connection, keep: str):
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, nbytes in conn.execute(
+            "SELECT key, nbytes FROM entries ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            total -= nbytes
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached audio file"""
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM entries")]
+            conn.execute("DELETE FROM entries")
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
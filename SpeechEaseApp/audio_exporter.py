@@ -0,0 +1,162 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import wave
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+from audio_format import ensure_wav
+from text_chunker import split_into_chunks
+
+# One engine per worker process, created by init_worker
+_worker_engine = None
+
+
+def init_worker(voice: str, rate: float, volume: float):
+    """Process pool initializer: create this worker's engine with the given settings"""
+    global _worker_engine
+    from tts_engine import TTSEngine
+    _worker_engine = TTSEngine()
+    _worker_engine.set_voice(voice)
+    _worker_engine.set_rate(rate)
+    _worker_engine.set_volume(volume)
+
+
+def render_chunks(index: int, texts: List[str], file_paths: List[str], use_cache: bool) -> int:
+    """Render texts to file_paths with the worker's engine and return index
+
+    Needs init_worker() to have run in this process. With use_cache the
+    audio comes from (and goes into) the AudioCache.
+    """
+    for text, file_path in zip(texts, file_paths):
+        if use_cache:
+            # Copy out of the cache so eviction cannot remove it before stitching
+            shutil.copyfile(_worker_engine.render_chunk(text), file_path)
+        else:
+            _worker_engine.save_to_file(text, file_path)
+    return index
+
+
+def batch_spans(spans: List[Tuple[int, int]], target_chars: int) -> List[List[int]]:
+    """Group consecutive span indexes into batches of roughly target_chars each"""
+    batches: List[List[int]] = []
+    for i, (start, end) in enumerate(spans):
+        if batches and end - spans[batches[-1][0]][0] <= target_chars:
+            batches[-1].append(i)
+        else:
+            batches.append([i])
+    return batches
+
+
+def stitch_wav_files(paths: List[str], output_path: str):
+    """Concatenate WAV files with identical formats into output_path, in order
+
+    AIFF chunks (from pyttsx3 on macOS) are converted to WAV first.
+    """
+    params = None
+    with wave.open(output_path, 'wb') as output:
+        for path in paths:
+            ensure_wav(path)
+            with wave.open(path, 'rb') as chunk:
+                chunk_params = chunk.getparams()[:3]
+                if params is None:
+                    params = chunk_params
+                    output.setnchannels(params[0])
+                    output.setsampwidth(params[1])
+                    output.setframerate(params[2])
+                elif chunk_params != params:
+                    raise ValueError(f"Audio format mismatch in {path}")
+                output.writeframes(chunk.readframes(chunk.getnframes()))
+
+
+class AudioExporter:
+    """Render text to a single WAV file using a pool of TTS worker processes.
+
+    The text is split into the same sentence chunks playback speaks, and
+    each worker process owns its own pyttsx3 engine and renders batches of
+    about chunk_chars characters, one WAV per sentence, which are stitched
+    back together in order. With use_cache, sentences already in the
+    AudioCache (from playback or an earlier export with the same settings)
+    are reused instead of rendered, and rendered ones are cached for
+    playback.
+    Nothing here depends on Flet, so it can be driven from scripts too.
+    """
+
+    def __init__(self, voice: str = "default", rate: float = 1.0, volume: float = 0.8,
+                 workers: Optional[int] = None, chunk_chars: int = 2000,
+                 use_cache: bool = True):
+        self.voice = voice
+        self.rate = rate
+        self.volume = volume
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_chars = chunk_chars
+        self.use_cache = use_cache
+
+    def export(self, text: str, output_path: str,
+               progress: Optional[Callable[[int, int], None]] = None) -> str:
+        """Render text to output_path, calling progress(done, total) per batch"""
+        # The spans TTSEngine plays in "sentence" mode, so cache keys match
+        spans = split_into_chunks(text)
+        if not spans:
+            raise ValueError("Nothing to export")
+        batches = batch_spans(spans, self.chunk_chars)
+
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(output_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix="speechease_export_")
+        try:
+            paths = [os.path.join(work_dir, f"chunk_{i:06d}.wav") for i in range(len(spans))]
+            # spawn keeps workers independent of any threads or speech driver
+            # state in the parent (e.g. a running Flet session)
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(batches)),
+                mp_context=context,
+                initializer=init_worker,
+                initargs=(self.voice, self.rate, self.volume),
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        render_chunks, i,
+                        [text[start:end] for start, end in (spans[j] for j in batch)],
+                        [paths[j] for j in batch], self.use_cache,
+                    )
+                    for i, batch in enumerate(batches)
+                ]
+                for done, future in enumerate(as_completed(futures), start=1):
+                    future.result()
+                    if progress:
+                        progress(done, len(batches))
+            stitch_wav_files(paths, output_path)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return output_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a document to a WAV file")
+    parser.add_argument("input", help="PDF, DOCX or TXT file")
+    parser.add_argument("output", help="WAV file to write")
+    parser.add_argument("--voice", default="default", choices=["default", "male", "female"])
+    parser.add_argument("--rate", type=float, default=1.0)
+    parser.add_argument("--volume", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from document_processor import DocumentProcessor
+    text = DocumentProcessor.process_document(args.input)
+    if not text:
+        parser.error(f"Could not extract text from {args.input}")
+
+    def report(done, total):
+        print(f"\rRendered {done}/{total} chunks", end="", flush=True)
+
+    exporter = AudioExporter(args.voice, args.rate, args.volume, args.workers)
+    exporter.export(text, args.output, progress=report)
+    print(f"\nExported: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+import struct
+import wave
+from typing import Tuple
+
+# Compression types of uncompressed AIFF-C sample data
+_BIG_ENDIAN = (b"NONE", b"twos")
+_LITTLE_ENDIAN = (b"sowt",)
+
+
+def _extended_to_float(data: bytes) -> float:
+    """Decode the 80-bit IEEE extended float AIFF uses for its sample rate"""
+    exponent = ((data[0] & 0x7F) << 8) | data[1]
+    mantissa = int.from_bytes(data[2:10], "big")
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    value = mantissa * 2.0 ** (exponent - 16383 - 63)
+    return -value if data[0] & 0x80 else value
+
+
+def read_aiff(file_path: str) -> Tuple[int, int, int, bytes]:
+    """Return (channels, sample width, frame rate, little-endian PCM frames) of an AIFF file"""
+    with open(file_path, "rb") as f:
+        data = f.read()
+    if data[:4] != b"FORM" or data[8:12] not in (b"AIFF", b"AIFC"):
+        raise ValueError(f"Not an AIFF file: {file_path}")
+    compressed = data[8:12] == b"AIFC"
+    common = None
+    frames = None
+    position = 12
+    while position + 8 <= len(data):
+        chunk_id = data[position:position + 4]
+        size = struct.unpack(">I", data[position + 4:position + 8])[0]
+        body = data[position + 8:position + 8 + size]
+        if chunk_id == b"COMM":
+            common = body
+        elif chunk_id == b"SSND":
+            offset = struct.unpack(">I", body[:4])[0]
+            frames = body[8 + offset:]
+        # Chunks are padded to an even size
+        position += 8 + size + (size & 1)
+    if common is None or frames is None:
+        raise ValueError(f"Incomplete AIFF file: {file_path}")
+    channels, frame_count, bits = struct.unpack(">hIh", common[:8])
+    rate = int(round(_extended_to_float(common[8:18])))
+    width = (bits + 7) // 8
+    compression = common[18:22] if compressed else b"NONE"
+    if compression not in _BIG_ENDIAN + _LITTLE_ENDIAN:
+        raise ValueError(f"Unsupported AIFF-C compression {compression!r}: {file_path}")
+    frames = frames[:frame_count * channels * width]
+    if width == 1:
+        # AIFF 8-bit samples are signed, WAV ones unsigned
+        frames = bytes((sample + 128) & 0xFF for sample in frames)
+    elif compression in _BIG_ENDIAN:
+        swapped = bytearray(len(frames))
+        for i in range(width):
+            swapped[i::width] = frames[width - 1 - i::width]
+        frames = bytes(swapped)
+    return channels, width, rate, frames
+
+
+def ensure_wav(file_path: str):
+    """Convert an AIFF file to WAV in place; WAV files are left alone
+
+    pyttsx3's macOS driver saves AIFF whatever the file extension, while
+    the players, the audio cache and export all expect WAV.
+    """
+    with open(file_path, "rb") as f:
+        header = f.read(12)
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return
+    if header[:4] != b"FORM":
+        raise ValueError(f"Unsupported audio format (expected WAV or AIFF): {file_path}")
+    channels, width, rate, frames = read_aiff(file_path)
+    temp_path = file_path + ".wav.tmp"
+    with wave.open(temp_path, "wb") as output:
+        output.setnchannels(channels)
+        output.setsampwidth(width)
+        output.setframerate(rate)
+        output.writeframes(frames)
+    os.replace(temp_path, file_path)
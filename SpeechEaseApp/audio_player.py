@@ -0,0 +1,40 @@
+from typing import Optional
+
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+
+class WavPlayer:
+    """Plays rendered WAV chunks on the local sound device via simpleaudio"""
+
+    def __init__(self):
+        self._play_obj = None
+
+    def start(self, file_path: str):
+        """Start playing a WAV file and return immediately"""
+        wave_obj = simpleaudio.WaveObject.from_wave_file(file_path)
+        self._play_obj = wave_obj.play()
+
+    def wait(self):
+        """Block until the current file finishes or stop() is called"""
+        if self._play_obj is not None:
+            self._play_obj.wait_done()
+
+    def is_playing(self) -> bool:
+        return self._play_obj is not None and self._play_obj.is_playing()
+
+    def play(self, file_path: str):
+        """Play a WAV file, blocking until it finishes or stop() is called"""
+        self.start(file_path)
+        self.wait()
+
+    def stop(self):
+        if self._play_obj is not None:
+            self._play_obj.stop()
+
+
+def create_local_player() -> Optional[WavPlayer]:
+    """Return a WavPlayer, or None when simpleaudio is not installed"""
+    return WavPlayer() if simpleaudio is not None else None
@@ -0,0 +1,245 @@
+"""Convert a directory tree of documents to WAV files without the GUI.
+
+Every PDF, DOCX and TXT file under the input directory is extracted with
+DocumentProcessor and spoken to a WAV file by a TTSEngine, mirroring the
+directory layout under the output directory. Files are converted in
+parallel, one per worker process, each worker owning its own engine.
+
+Outputs are written to a temporary file and renamed when complete, so an
+interrupted run never leaves a truncated WAV behind. Files whose output is
+newer than the source are skipped, which makes re-running the same command
+resume where it stopped; with the audio cache (the default) chunks rendered
+before the interruption are reused too. Pass --force to convert everything
+again, e.g. after changing the voice.
+
+A JSON summary with per-file status, timings and errors is rewritten after
+each file. Run from the SpeechEaseApp directory:
+
+    python batch_convert.py INPUT_DIR OUTPUT_DIR [--workers 4] [--voice female]
+                            [--rate 1.0] [--volume 0.8] [--summary summary.json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+from audio_exporter import init_worker, render_chunks, stitch_wav_files
+from document_processor import DocumentProcessor
+from text_chunker import split_into_chunks
+
+SUMMARY_NAME = "batch_summary.json"
+
+
+def find_documents(input_dir: str) -> List[str]:
+    """Return the supported documents under input_dir, relative to it, sorted"""
+    documents = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in DocumentProcessor.SUPPORTED_EXTENSIONS:
+                documents.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return documents
+
+
+def plan_outputs(documents: List[str]) -> Dict[str, str]:
+    """Map each document to its WAV path, relative to the output directory
+
+    report.pdf becomes report.wav; when several documents in a directory
+    share a name (report.pdf, report.txt) they keep their extension instead
+    (report.pdf.wav, report.txt.wav).
+    """
+    stems = Counter(os.path.splitext(document)[0].lower() for document in documents)
+    outputs = {}
+    for document in documents:
+        stem = os.path.splitext(document)[0]
+        outputs[document] = (stem if stems[stem.lower()] == 1 else document) + ".wav"
+    return outputs
+
+
+def is_up_to_date(source: str, output: str) -> bool:
+    """Whether output exists and was written after source last changed"""
+    try:
+        return os.path.getmtime(output) >= os.path.getmtime(source)
+    except OSError:
+        return False
+
+
+def convert_document(source: str, output: str, use_cache: bool = True) -> dict:
+    """Extract and speak one document to output (in a worker process)
+
+    Returns the file's summary entry; failures are reported in it rather
+    than raised, so one bad file does not stop the batch.
+    """
+    entry = {"status": "converted", "chars": 0, "chunks": 0,
+             "extract_seconds": 0.0, "synthesis_seconds": 0.0}
+    start = time.perf_counter()
+    work_dir = None
+    temp_output = None
+    try:
+        # Batch runs stay out of the GUI's search index
+        result = DocumentProcessor.extract_document(source, index=False)
+        entry["extract_seconds"] = time.perf_counter() - start
+        text = result[0] if result else ""
+        # Sentence chunks, as played and cached by the app
+        spans = split_into_chunks(text)
+        if not spans:
+            raise ValueError("No text could be extracted")
+        entry["chars"] = len(text)
+        entry["chunks"] = len(spans)
+
+        synthesis_start = time.perf_counter()
+        work_dir = tempfile.mkdtemp(prefix="speechease_batch_")
+        paths = [os.path.join(work_dir, f"chunk_{i:06d}.wav") for i in range(len(spans))]
+        render_chunks(0, [text[chunk_start:chunk_end] for chunk_start, chunk_end in spans],
+                      paths, use_cache)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        temp_output = f"{output}.{os.getpid()}.part"
+        stitch_wav_files(paths, temp_output)
+        os.replace(temp_output, output)
+        temp_output = None
+        entry["synthesis_seconds"] = time.perf_counter() - synthesis_start
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        # A failed stitch or rename leaves no partial output behind
+        if temp_output is not None and os.path.exists(temp_output):
+            os.remove(temp_output)
+    entry["seconds"] = time.perf_counter() - start
+    return entry
+
+
+def write_summary(path: str, summary: dict):
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def convert_directory(input_dir: str, output_dir: str, voice: str = "default",
+                      rate: float = 1.0, volume: float = 0.8,
+                      workers: Optional[int] = None, force: bool = False,
+                      use_cache: bool = True, summary_path: Optional[str] = None) -> dict:
+    """Convert every document under input_dir and return the run's summary"""
+    summary_path = summary_path or os.path.join(output_dir, SUMMARY_NAME)
+    os.makedirs(output_dir, exist_ok=True)
+    documents = find_documents(input_dir)
+    outputs = plan_outputs(documents)
+    summary = {
+        "input_dir": os.path.abspath(input_dir),
+        "output_dir": os.path.abspath(output_dir),
+        "settings": {"voice": voice, "rate": rate, "volume": volume},
+        "started": time.time(),
+        "finished": None,
+        "interrupted": False,
+        "totals": {"converted": 0, "skipped": 0, "failed": 0, "pending": 0},
+        "files": [],
+    }
+    entries: Dict[str, dict] = {}
+    pending: List[Tuple[str, str, str]] = []
+    for document in documents:
+        source = os.path.join(input_dir, document)
+        output = os.path.join(output_dir, outputs[document])
+        entry = {"source": document, "output": outputs[document], "status": "pending"}
+        entries[document] = entry
+        summary["files"].append(entry)
+        if not force and is_up_to_date(source, output):
+            entry["status"] = "skipped"
+        else:
+            pending.append((document, source, output))
+
+    def update_totals():
+        summary["totals"] = {status: 0 for status in ("converted", "skipped", "failed", "pending")}
+        for entry in entries.values():
+            summary["totals"][entry["status"]] += 1
+
+    update_totals()
+    write_summary(summary_path, summary)
+    print(f"{len(documents)} documents, {len(pending)} to convert, "
+          f"{len(documents) - len(pending)} up to date")
+    if not pending:
+        summary["finished"] = time.time()
+        write_summary(summary_path, summary)
+        return summary
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    # spawn keeps each worker's speech driver independent of the parent
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(voice, rate, volume),
+    )
+    try:
+        futures = {
+            executor.submit(convert_document, source, output, use_cache): document
+            for document, source, output in pending
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            document = futures[future]
+            try:
+                entries[document].update(future.result())
+            except Exception as e:
+                # The worker process itself died (e.g. the speech driver crashed)
+                entries[document].update(status="failed", error=f"{type(e).__name__}: {e}")
+            entry = entries[document]
+            detail = entry.get("error") or f"{entry['seconds']:.1f} s"
+            print(f"[{done}/{len(pending)}] {entry['status']} {document} ({detail})")
+            update_totals()
+            write_summary(summary_path, summary)
+    except KeyboardInterrupt:
+        summary["interrupted"] = True
+        print("Interrupted; run the same command again to resume")
+        raise
+    finally:
+        executor.shutdown(wait=not summary["interrupted"], cancel_futures=True)
+        summary["finished"] = time.time()
+        update_totals()
+        write_summary(summary_path, summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert every PDF, DOCX and TXT file under a directory to WAV files")
+    parser.add_argument("input_dir", help="Directory to search for documents")
+    parser.add_argument("output_dir", help="Directory for the WAV files, mirroring input_dir")
+    parser.add_argument("--voice", default="default", choices=["default", "male", "female"])
+    parser.add_argument("--rate", type=float, default=1.0)
+    parser.add_argument("--volume", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="Convert documents whose output is already up to date")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Render every chunk instead of reusing the audio cache")
+    parser.add_argument("--summary", default=None,
+                        help=f"JSON summary path (default: OUTPUT_DIR/{SUMMARY_NAME})")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"Not a directory: {args.input_dir}")
+
+    try:
+        summary = convert_directory(
+            args.input_dir, args.output_dir, voice=args.voice, rate=args.rate,
+            volume=args.volume, workers=args.workers, force=args.force,
+            use_cache=not args.no_cache, summary_path=args.summary,
+        )
+    except KeyboardInterrupt:
+        return 130
+    totals = summary["totals"]
+    print(f"Converted {totals['converted']}, skipped {totals['skipped']}, "
+          f"failed {totals['failed']}")
+    return 1 if totals["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
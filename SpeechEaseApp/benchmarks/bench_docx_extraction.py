@@ -0,0 +1,107 @@
+"""Compare the streaming DOCX reader with python-docx on synthetic reports.
+
+Run from the SpeechEaseApp directory:
+
+    python -m benchmarks.bench_docx_extraction [--paragraphs 1000 10000 50000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import List
+
+from docx_reader import iter_docx_paragraphs
+from benchmarks.synthetic import make_docx
+
+
+def extract_streaming(path: str) -> str:
+    return "\n".join(iter_docx_paragraphs(path)).strip()
+
+
+def extract_python_docx(path: str) -> str:
+    from docx import Document
+    return "\n".join(paragraph.text for paragraph in Document(path).paragraphs).strip()
+
+
+def python_docx_paragraphs(path: str) -> List[str]:
+    """Every paragraph python-docx sees, in the order the streaming reader yields them
+
+    Document.paragraphs skips tables, so body paragraphs and the cells of
+    each table (row by row) are interleaved by walking the body; headers
+    come first and footers last.
+    """
+    from docx import Document
+    from docx.oxml.ns import qn
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+    document = Document(path)
+    body = []
+    for element in document.element.body.iterchildren():
+        if element.tag == qn("w:p"):
+            body.append(Paragraph(element, document).text)
+        elif element.tag == qn("w:tbl"):
+            body.extend(paragraph.text for row in Table(element, document).rows
+                        for cell in row.cells for paragraph in cell.paragraphs)
+    headers = [paragraph.text for section in document.sections
+               for paragraph in section.header.paragraphs]
+    footers = [paragraph.text for section in document.sections
+               for paragraph in section.footer.paragraphs]
+    return headers + body + footers
+
+
+def check_same_paragraphs(path: str):
+    """Raise AssertionError unless both readers return the same paragraphs
+
+    Body paragraphs are also checked against Document.paragraphs on their
+    own, so table and header text cannot hide a missing body paragraph.
+    """
+    from docx import Document
+    expected = python_docx_paragraphs(path)
+    streamed = list(iter_docx_paragraphs(path, headers_footers=True))
+    for number, (old, new) in enumerate(zip(expected, streamed)):
+        assert old == new, f"paragraph {number} differs: {old!r} != {new!r}"
+    assert len(expected) == len(streamed), \
+        f"python-docx found {len(expected)} paragraphs, the streaming reader {len(streamed)}"
+    body = [paragraph.text for paragraph in Document(path).paragraphs]
+    streamed_body = iter(iter_docx_paragraphs(path))
+    # Every body paragraph, in order, with only table cells in between
+    assert all(any(text == candidate for candidate in streamed_body) for text in body), \
+        "body paragraphs are missing or out of order"
+
+
+def measure(func, path: str):
+    """Return (seconds, peak traced bytes, result), timed without tracing"""
+    start = time.perf_counter()
+    result = func(path)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    func(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--table-every", type=int, default=20,
+                        help="add a 3x3 table after every N paragraphs (0 for none)")
+    args = parser.parse_args()
+
+    print(f"{'paragraphs':>10} {'python-docx s':>14} {'stream s':>9} {'speedup':>8} "
+          f"{'python-docx MB':>15} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for paragraphs in args.paragraphs:
+            path = os.path.join(tmp, f"synthetic_{paragraphs}.docx")
+            make_docx(path, paragraphs, table_every=args.table_every,
+                      header="Synthetic report", footer="Page footer")
+            check_same_paragraphs(path)
+            old_time, old_peak, _ = measure(extract_python_docx, path)
+            new_time, new_peak, _ = measure(extract_streaming, path)
+            print(f"{paragraphs:>10} {old_time:>14.2f} {new_time:>9.2f} "
+                  f"{old_time / new_time:>7.1f}x {old_peak / 1e6:>15.1f} {new_peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
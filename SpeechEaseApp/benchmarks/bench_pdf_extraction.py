@@ -0,0 +1,44 @@
+"""Compare serial and parallel PDF extraction on synthetic documents.
+
+Run from the SpeechEaseApp directory:
+
+    python -m benchmarks.bench_pdf_extraction [--pages 100 500 2000] [--workers N]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from document_processor import DocumentProcessor
+from benchmarks.synthetic import make_pdf
+
+
+def time_call(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} {'serial s':>10} {'parallel s':>11} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"synthetic_{pages}.pdf")
+            make_pdf(path, pages)
+            serial_time, serial_text = time_call(
+                DocumentProcessor.extract_text_from_pdf, path, use_cache=False)
+            parallel_time, parallel_text = time_call(
+                DocumentProcessor.extract_text_from_pdf, path,
+                parallel=True, workers=args.workers, min_pages=0, use_cache=False)
+            assert serial_text == parallel_text, "parallel output differs from serial"
+            print(f"{pages:>6} {serial_time:>10.2f} {parallel_time:>11.2f} "
+                  f"{serial_time / parallel_time:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Measure app startup: imports, construction and time to the first page.update().
+
+Each run starts a fresh interpreter, so module imports are included just
+as they are for a new desktop launch. In web mode the construction and
+first-frame costs are paid again by every new session. The page is a real
+ft.Page whose connection answers in-process instead of over a socket, so
+the numbers exclude network and client rendering time.
+
+Run from the SpeechEaseApp directory:
+
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Set first so the import time of everything below is counted
+_PROCESS_START = time.perf_counter()
+
+
+def _child():
+    from benchmarks.local_page import make_page
+    from main import SpeechEaseAppEnhanced
+    imported = time.perf_counter()
+
+    page, conn = make_page()
+    app = SpeechEaseAppEnhanced()
+    constructed = time.perf_counter()
+    app.main(page)
+
+    print(json.dumps({
+        "import_s": imported - _PROCESS_START,
+        "construct_s": constructed - imported,
+        "first_update_s": conn.first_send - _PROCESS_START,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child()
+        return
+
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the library, caches and settings of the runs out of the real ones
+        env = dict(os.environ, HOME=tmp, USERPROFILE=tmp,
+                   PYTHONPATH=os.pathsep.join(filter(None, [here, os.environ.get("PYTHONPATH")])))
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+                cwd=tmp, env=env, check=True,
+                capture_output=True, text=True,
+            ).stdout
+            # The app's background threads may print into the same output
+            # (e.g. a missing speech driver), so look for the result itself
+            start = output.rindex('{"import_s"')
+            results.append(json.loads(output[start:output.index("}", start) + 1]))
+
+    print(f"{'':>16} {'median s':>9} {'min s':>7} {'max s':>7}")
+    for key in ("import_s", "construct_s", "first_update_s"):
+        values = [result[key] for result in results]
+        print(f"{key:>16} {statistics.median(values):>9.3f} "
+              f"{min(values):>7.3f} {max(values):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
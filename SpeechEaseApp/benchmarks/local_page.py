@@ -0,0 +1,50 @@
+"""A real ft.Page driven in-process, for measuring view building without a client"""
+import asyncio
+import json
+import time
+
+import flet as ft
+from flet_core.connection import Connection
+from flet_core.protocol import CommandEncoder, PageCommandsBatchResponsePayload
+
+
+class LocalConnection(Connection):
+    """Hands out control ids like the Flet server and records what would be sent"""
+
+    def __init__(self):
+        super().__init__()
+        self.first_send = None
+        self.sends = 0
+        self.bytes_sent = 0
+        self.controls_added = 0
+        self._next_id = 0
+
+    def reset_counters(self):
+        self.sends = 0
+        self.bytes_sent = 0
+        self.controls_added = 0
+
+    def send_commands(self, session_id, commands):
+        if self.first_send is None:
+            self.first_send = time.perf_counter()
+        self.sends += 1
+        self.bytes_sent += len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+        results = []
+        for command in commands:
+            if command.name == "add":
+                ids = []
+                for _ in command.commands:
+                    self._next_id += 1
+                    ids.append(f"_{self._next_id}")
+                self.controls_added += len(ids)
+                results.append(" ".join(ids))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def send_command(self, session_id, command):
+        return self.send_commands(session_id, [command])
+
+
+def make_page():
+    """Return (page, connection) for a page that is never shown anywhere"""
+    conn = LocalConnection()
+    return ft.Page(conn, "bench", asyncio.new_event_loop()), conn
@@ -0,0 +1,84 @@
+"""Offline stand-ins for the speech driver and audio player.
+
+NullDriver implements the part of pyttsx3's driver interface TTSEngine
+uses. It "speaks" instantly, firing a started-word event per word, and
+save_to_file() writes silent 16-bit mono WAV sized to the text at about
+15 characters per second, so audio caching and stitching see realistic
+file sizes. NullPlayer accepts chunks and finishes immediately.
+"""
+import re
+import threading
+import wave
+from collections import namedtuple
+
+Voice = namedtuple("Voice", "id name")
+
+_WORD = re.compile(r"\S+")
+SAMPLE_RATE = 8000
+CHARS_PER_SECOND = 15
+
+
+class NullDriver:
+    def __init__(self):
+        self._queue = []
+        self._callbacks = {}
+        self._stopped = threading.Event()
+        self.properties = {
+            "voices": [Voice("null-male", "Null Male"), Voice("null-female", "Null Female")],
+            "voice": "null-male",
+            "rate": 200,
+            "volume": 1.0,
+        }
+
+    def connect(self, topic, callback):
+        self._callbacks.setdefault(topic, []).append(callback)
+
+    def getProperty(self, name):
+        return self.properties[name]
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def say(self, text, name=None):
+        self._queue.append(("say", text, None))
+
+    def save_to_file(self, text, path, name=None):
+        self._queue.append(("file", text, path))
+
+    def stop(self):
+        self._stopped.set()
+
+    def runAndWait(self):
+        self._stopped.clear()
+        queue, self._queue = self._queue, []
+        for kind, text, path in queue:
+            if kind == "file":
+                frames = SAMPLE_RATE * len(text) // CHARS_PER_SECOND
+                with wave.open(path, "wb") as wav:
+                    wav.setnchannels(1)
+                    wav.setsampwidth(2)
+                    wav.setframerate(SAMPLE_RATE)
+                    wav.writeframes(b"\x00\x00" * frames)
+                continue
+            for match in _WORD.finditer(text):
+                for callback in self._callbacks.get("started-word", []):
+                    callback(None, match.start(), match.end() - match.start())
+                if self._stopped.is_set():
+                    return
+
+
+class NullPlayer:
+    def start(self, file_path):
+        pass
+
+    def wait(self):
+        pass
+
+    def is_playing(self):
+        return False
+
+    def play(self, file_path):
+        pass
+
+    def stop(self):
+        pass
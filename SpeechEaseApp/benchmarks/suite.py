@@ -0,0 +1,288 @@
+"""Benchmark suite: extraction, chunking, synthesis and view building.
+
+Generates PDF, DOCX and TXT corpora of a configurable size and measures:
+
+  extraction  seconds, MB/s, chars/s and peak traced memory per format
+  chunking    split_into_chunks time per mode on the extracted text, and
+              TextIndex build, load and lookup times
+  synthesis   TTSEngine speaking and rendering through a null driver
+  views       build time, first update time, controls and payload bytes
+              of create_home_view and create_document_view
+
+Everything runs offline and headless; the app's library, caches and
+settings are redirected to a temporary directory. Results are printed and
+written as JSON, and a previous results file can be passed to --compare.
+
+Run from the SpeechEaseApp directory:
+
+    python -m benchmarks.suite [--scale 1] [--repeat 3] [--output results.json]
+                               [--compare previous.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from benchmarks.synthetic import make_docx, make_pdf, make_txt
+
+# Corpus size at --scale 1
+PDF_PAGES = 50
+DOCX_PARAGRAPHS = 2000
+TXT_PARAGRAPHS = 2000
+# Text spoken by the synthesis benchmark
+SYNTHESIS_CHARS = 50000
+
+
+def timed(func, repeat: int):
+    """Return (median seconds over `repeat` calls, last result)"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def peak_memory(func) -> int:
+    """Peak bytes allocated by Python while func runs (timed separately)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def make_corpus(directory: str, scale: float) -> dict:
+    corpus = {
+        "pdf": os.path.join(directory, "corpus.pdf"),
+        "docx": os.path.join(directory, "corpus.docx"),
+        "txt": os.path.join(directory, "corpus.txt"),
+    }
+    make_pdf(corpus["pdf"], max(1, int(PDF_PAGES * scale)))
+    make_docx(corpus["docx"], max(1, int(DOCX_PARAGRAPHS * scale)))
+    make_txt(corpus["txt"], max(1, int(TXT_PARAGRAPHS * scale)))
+    return corpus
+
+
+def bench_extraction(corpus: dict, repeat: int) -> dict:
+    from document_processor import DocumentProcessor
+
+    results = {}
+    for fmt, path in corpus.items():
+        def extract():
+            return DocumentProcessor.extract_document(path, use_cache=False, index=False)
+        seconds, (text, _) = timed(extract, repeat)
+        size = os.path.getsize(path)
+        results[fmt] = {
+            "file_bytes": size,
+            "chars": len(text),
+            "seconds": seconds,
+            "mb_per_s": size / seconds / 1e6,
+            "chars_per_s": len(text) / seconds,
+            "peak_bytes": peak_memory(extract),
+        }
+    return results
+
+
+def bench_chunking(text: str, repeat: int) -> dict:
+    from text_chunker import CHUNK_MODES, split_into_chunks
+
+    results = {}
+    for mode in CHUNK_MODES:
+        seconds, spans = timed(lambda: split_into_chunks(text, mode), repeat)
+        results[mode] = {"seconds": seconds, "chunks": len(spans),
+                         "chars_per_s": len(text) / seconds}
+
+    from text_index import TextIndex
+    seconds, index = timed(lambda: TextIndex.build(text), repeat)
+    data = index.to_bytes()
+    load_seconds, _ = timed(lambda: TextIndex.from_bytes(data), repeat)
+    offsets = range(0, len(text), max(1, len(text) // 1000))
+    lookup_seconds, _ = timed(lambda: [index.sentence_at(offset) for offset in offsets], repeat)
+    results["index"] = {"seconds": seconds, "load_seconds": load_seconds,
+                        "bytes": len(data), "lookup_us": lookup_seconds / len(offsets) * 1e6}
+    return results
+
+
+def _speak_to_end(engine, text: str) -> dict:
+    words = []
+    first_word = []
+    done = threading.Event()
+
+    def on_word(offset, length):
+        if not first_word:
+            first_word.append(time.perf_counter())
+        words.append(offset)
+
+    def on_state_change(state):
+        if state == "idle":
+            done.set()
+
+    engine.on_state_change = on_state_change
+    start = time.perf_counter()
+    engine.speak(text, on_word=on_word)
+    done.wait()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "first_word_s": first_word[0] - start if first_word else None,
+        "chunks": len(engine.chunks),
+        "word_events": len(words),
+    }
+
+
+def bench_synthesis(text: str, cache_dir: str) -> dict:
+    from audio_cache import AudioCache
+    from benchmarks.null_tts import NullDriver, NullPlayer
+    from tts_engine import TTSEngine
+
+    text = text[:SYNTHESIS_CHARS]
+    results = {}
+
+    # Driver path: say/runAndWait per chunk with word events
+    engine = TTSEngine(driver_factory=NullDriver)
+    engine.player = None
+    results["speak"] = _speak_to_end(engine, text)
+    engine.shutdown()
+
+    # Player path: chunks rendered to WAV through the audio cache, then
+    # replayed from it
+    engine = TTSEngine(driver_factory=NullDriver)
+    engine.player = NullPlayer()
+    engine.audio_cache = AudioCache(cache_dir)
+    results["render_cold"] = _speak_to_end(engine, text)
+    results["render_cold"]["cache_bytes"] = engine.audio_cache.total_bytes()
+    results["render_warm"] = _speak_to_end(engine, text)
+    engine.shutdown()
+    return results
+
+
+def bench_views(text: str, repeat: int) -> dict:
+    from benchmarks.local_page import make_page
+    from main import SpeechEaseAppEnhanced
+
+    page, conn = make_page()
+    app = SpeechEaseAppEnhanced()
+    app.main(page)
+    app.tts_engine.shutdown()
+
+    results = {}
+
+    def show(build):
+        def run():
+            conn.reset_counters()
+            start = time.perf_counter()
+            view = build()
+            built = time.perf_counter()
+            app.content_area.content = view
+            page.update()
+            return {
+                "build_s": built - start,
+                "update_s": time.perf_counter() - built,
+                "sends": conn.sends,
+                "controls": conn.controls_added,
+                "payload_bytes": conn.bytes_sent,
+            }
+        runs = [run() for _ in range(repeat)]
+        summary = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+        summary["peak_bytes"] = peak_memory(build)
+        return summary
+
+    results["home"] = show(app.create_home_view)
+
+    app.current_text = text
+    app.current_document = {"id": None, "name": "corpus.txt", "path": None, "text": text}
+    results["document"] = show(app.create_document_view)
+    results["document"]["chars"] = len(text)
+    app.settings_store.close()
+    return results
+
+
+def flatten(results: dict, prefix: str = ""):
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(current: dict, previous: dict):
+    old = dict(flatten(previous["results"]))
+    print(f"\n{'metric':<44} {'previous':>12} {'current':>12} {'change':>8}")
+    for name, value in flatten(current["results"]):
+        if name not in old:
+            continue
+        change = f"{(value - old[name]) / old[name] * 100:+.1f}%" if old[name] else ""
+        print(f"{name:<44} {old[name]:>12.4g} {value:>12.4g} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="corpus size multiplier (default 1)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed repetitions per measurement, median reported")
+    parser.add_argument("--only", nargs="+",
+                        choices=["extraction", "chunking", "synthesis", "views"])
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    args = parser.parse_args()
+    sections = args.only or ["extraction", "chunking", "synthesis", "views"]
+    output = os.path.abspath(args.output) if args.output else None
+    previous = os.path.abspath(args.compare) if args.compare else None
+    cwd = os.getcwd()
+    sys.path.insert(0, cwd)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the app's library, caches and settings out of the real ones.
+        # The app modules read these locations when first imported.
+        os.environ["HOME"] = os.environ["USERPROFILE"] = tmp
+        os.chdir(tmp)
+
+        corpus = make_corpus(tmp, args.scale)
+        with open(corpus["txt"], encoding="utf-8") as f:
+            text = f.read()
+
+        results = {}
+        if "extraction" in sections:
+            results["extraction"] = bench_extraction(corpus, args.repeat)
+        if "chunking" in sections:
+            results["chunking"] = bench_chunking(text, args.repeat)
+        if "synthesis" in sections:
+            results["synthesis"] = bench_synthesis(text, os.path.join(tmp, "audio"))
+        if "views" in sections:
+            results["views"] = bench_views(text, args.repeat)
+        os.chdir(cwd)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    for name, value in flatten(results):
+        print(f"{name:<44} {value:>14.4g}")
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if previous:
+        with open(previous, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Synthetic document generators for the benchmarks"""
+import random
+
+WORDS = (
+    "speech reading document accessible voice page sentence paragraph "
+    "listen text audio learning focus chapter manual section example "
+    "quick brown fox jumps over the lazy dog while narrator keeps pace"
+).split()
+
+
+def make_sentence(rng: random.Random, words: int = 12) -> str:
+    sentence = " ".join(rng.choice(WORDS) for _ in range(words))
+    return sentence.capitalize() + "."
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 40, seed: int = 0,
+             scanned_every: int = 0):
+    """Write a minimal, valid PDF with `pages` pages of Helvetica text
+
+    With scanned_every=N, every Nth page instead holds only a full-page
+    image, like a scanned page without OCR.
+    """
+    import zlib
+
+    rng = random.Random(seed)
+    font_id = 3 + 2 * pages
+    image_id = font_id + 1
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(pages)), pages)).encode(),
+    ]
+    for i in range(pages):
+        if scanned_every and (i + 1) % scanned_every == 0:
+            objects.append((
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Contents {4 + 2 * i} 0 R /Resources << /XObject << /Im0 {image_id} 0 R >> >> >>"
+            ).encode())
+            stream = b"q 612 0 0 792 0 0 cm /Im0 Do Q"
+        else:
+            objects.append((
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                f"/Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"
+            ).encode())
+            lines = ["BT /F1 10 Tf 14 TL 50 760 Td"]
+            for _ in range(lines_per_page):
+                lines.append(f"({make_sentence(rng)}) Tj T*")
+            lines.append("ET")
+            stream = "\n".join(lines).encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    # A grey 850x1100 image shared by every scanned page
+    pixels = zlib.compress(bytes(rng.randrange(100, 156) for _ in range(850 * 1100)))
+    objects.append(
+        b"<< /Type /XObject /Subtype /Image /Width 850 /Height 1100 /ColorSpace /DeviceGray"
+        b" /BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n" % len(pixels)
+        + pixels + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def make_paragraphs(count: int, sentences: int = 5, seed: int = 0):
+    rng = random.Random(seed)
+    return [" ".join(make_sentence(rng) for _ in range(sentences)) for _ in range(count)]
+
+
+def make_txt(path: str, paragraphs: int, seed: int = 0):
+    """Write a UTF-8 text file of blank-line separated paragraphs"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n\n".join(make_paragraphs(paragraphs, seed=seed)))
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_DOCX_PART_TYPES = {
+    "header": "application/vnd.openxmlformats-officedocument.wordprocessingml.header+xml",
+    "footer": "application/vnd.openxmlformats-officedocument.wordprocessingml.footer+xml",
+}
+_W_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def make_docx(path: str, paragraphs: int, seed: int = 0, table_every: int = 0,
+              header: str = "", footer: str = ""):
+    """Write a minimal, valid DOCX with one run per paragraph
+
+    With table_every=N, a 3x3 table follows every N paragraphs. A non-empty
+    header or footer adds that part, with the text as its one paragraph.
+    """
+    import zipfile
+    from xml.sax.saxutils import escape
+
+    def paragraph(text):
+        return f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>"
+
+    blocks = []
+    for number, text in enumerate(make_paragraphs(paragraphs, seed=seed), start=1):
+        blocks.append(paragraph(text))
+        if table_every and number % table_every == 0:
+            rows = "".join(
+                "<w:tr>" + "".join(
+                    f"<w:tc>{paragraph(f'Row {row} column {col}')}</w:tc>" for col in range(3)
+                ) + "</w:tr>"
+                for row in range(3)
+            )
+            blocks.append(f"<w:tbl>{rows}</w:tbl>")
+    parts = {kind: text for kind, text in (("header", header), ("footer", footer)) if text}
+    references = "".join(
+        f'<w:{kind}Reference w:type="default" r:id="rId{kind}"/>' for kind in parts)
+    body = "".join(blocks) + (f"<w:sectPr>{references}</w:sectPr>" if parts else "")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document {_W_NAMESPACES}><w:body>{body}</w:body></w:document>'
+    )
+    content_types = _DOCX_CONTENT_TYPES.replace("</Types>", "".join(
+        f'<Override PartName="/word/{kind}1.xml" ContentType="{_DOCX_PART_TYPES[kind]}"/>'
+        for kind in parts) + "</Types>")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", _DOCX_RELS)
+        zf.writestr("word/document.xml", document)
+        if parts:
+            zf.writestr("word/_rels/document.xml.rels", (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                + "".join(
+                    f'<Relationship Id="rId{kind}" Type="http://schemas.openxmlformats.org/'
+                    f'officeDocument/2006/relationships/{kind}" Target="{kind}1.xml"/>'
+                    for kind in parts)
+                + '</Relationships>'))
+        for kind, text in parts.items():
+            tag = "hdr" if kind == "header" else "ftr"
+            zf.writestr(f"word/{kind}1.xml", (
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<w:{tag} {_W_NAMESPACES}>{paragraph(text)}</w:{tag}>'))
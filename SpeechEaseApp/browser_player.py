@@ -0,0 +1,67 @@
+import base64
+import threading
+import wave
+
+import flet as ft
+
+
+class BrowserPlayer:
+    """Plays rendered WAV chunks in the client's browser through ft.Audio.
+
+    Same interface as audio_player.WavPlayer, so TTSEngine can stream a
+    document to a remote user one chunk at a time: each chunk is sent as
+    a base64 WAV segment replacing the previous one, and wait() returns
+    when the client reports it completed (or after the chunk's duration
+    plus a grace period, in case the event is lost).
+    """
+
+    GRACE_SECONDS = 2.0
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self._done = threading.Event()
+        self._done.set()
+        self._timeout = 0.0
+        self.audio = ft.Audio(
+            src_base64="",
+            autoplay=True,
+            on_state_changed=self._on_state_changed,
+        )
+        # Sent to the client with the page's next update
+        page.overlay.append(self.audio)
+
+    def _on_state_changed(self, e):
+        # "stopped" is not used: swapping in the next segment can report it
+        # for the previous one after start() has already begun waiting
+        if e.data in ("completed", "disposed"):
+            self._done.set()
+
+    def start(self, file_path: str):
+        """Send a WAV file to the client and start playing it"""
+        with wave.open(file_path, 'rb') as wav:
+            duration = wav.getnframes() / float(wav.getframerate() or 1)
+        with open(file_path, 'rb') as file:
+            data = base64.b64encode(file.read()).decode('ascii')
+        self._timeout = duration + self.GRACE_SECONDS
+        self._done.clear()
+        self.audio.src_base64 = data
+        self.audio.update()
+
+    def wait(self):
+        """Block until the client finishes the current chunk or stop() is called"""
+        self._done.wait(self._timeout)
+
+    def is_playing(self) -> bool:
+        return not self._done.is_set()
+
+    def play(self, file_path: str):
+        """Play a WAV file in the browser, blocking until it finishes or stop() is called"""
+        self.start(file_path)
+        self.wait()
+
+    def stop(self):
+        self._done.set()
+        try:
+            self.audio.pause()
+        except Exception as e:
+            print(f"Audio error: {e}")
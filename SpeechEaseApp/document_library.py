@@ -0,0 +1,191 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import List, Optional, Tuple
+from text_index import TextIndex
+
+DEFAULT_LIBRARY_PATH = os.path.join(os.path.expanduser("~"), ".speechease", "library.db")
+
+
+class DocumentLibrary:
+    """Persistent library of opened documents backed by SQLite.
+
+    Metadata (name, path, dates, reading position) lives in a small table
+    that the home screen can query cheaply, while the extracted text is
+    kept zlib-compressed in a separate table and only read by load_text().
+    Documents are deduplicated by the SHA-256 of their text, so reopening
+    the same file updates its entry instead of adding another. Each text is
+    stored with its TextIndex, so reopening a document needs no rescan.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_LIBRARY_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL UNIQUE,"
+                " name TEXT NOT NULL, path TEXT, char_count INTEGER NOT NULL,"
+                " added REAL NOT NULL, last_opened REAL NOT NULL,"
+                " last_position INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS document_text ("
+                " id INTEGER PRIMARY KEY REFERENCES documents(id) ON DELETE CASCADE,"
+                " text BLOB NOT NULL, page_offsets TEXT NOT NULL, text_index BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS documents_recent ON documents(last_opened)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        doc_id, name, path, char_count, last_opened, last_position = row
+        return {
+            "id": doc_id,
+            "name": name,
+            "path": path,
+            "char_count": char_count,
+            "date": time.strftime("%Y-%m-%d", time.localtime(last_opened)),
+            "position": last_position,
+        }
+
+    def add_document(self, name: str, path: Optional[str], text: str,
+                     page_offsets: Optional[List[int]] = None,
+                     index: Optional[TextIndex] = None) -> Tuple[dict, Optional[TextIndex]]:
+        """Add a document (or refresh an identical one) and return (metadata, index)
+
+        The text's index is built here unless one is passed in; for a
+        document already in the library the stored index is returned.
+        """
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        now = time.time()
+        with self._connect() as conn:
+            # Inserting first takes the write lock, so concurrent adds of the
+            # same text cannot both create an entry
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO documents"
+                " (content_hash, name, path, char_count, added, last_opened)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (content_hash, name, path, len(text), now, now),
+            )
+            if cursor.rowcount:
+                doc_id = cursor.lastrowid
+                index = index or TextIndex.build(text, page_offsets)
+                conn.execute(
+                    "INSERT INTO document_text (id, text, page_offsets, text_index)"
+                    " VALUES (?, ?, ?, ?)",
+                    (doc_id, zlib.compress(text.encode('utf-8')), json.dumps(page_offsets or [0]),
+                     index.to_bytes()),
+                )
+            else:
+                doc_id = conn.execute(
+                    "SELECT id FROM documents WHERE content_hash = ?", (content_hash,)
+                ).fetchone()[0]
+                conn.execute(
+                    "UPDATE documents SET name = ?, path = ?, last_opened = ? WHERE id = ?",
+                    (name, path, now, doc_id),
+                )
+        if index is None:
+            index = self.load_index(doc_id, text)
+        return self.get_document(doc_id), index
+
+    def get_document(self, doc_id: int) -> Optional[dict]:
+        """Return metadata for one document, without its text"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, name, path, char_count, last_opened, last_position"
+                " FROM documents WHERE id = ?", (doc_id,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def find_by_hash(self, content_hash: str) -> Optional[dict]:
+        """Return metadata for the document whose text has this SHA-256"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, name, path, char_count, last_opened, last_position"
+                " FROM documents WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def recent_documents(self, limit: int = 10) -> List[dict]:
+        """Return metadata for the most recently opened documents"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, name, path, char_count, last_opened, last_position"
+                " FROM documents ORDER BY last_opened DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def load_text(self, doc_id: int) -> Optional[str]:
+        """Read and decompress a document's text, marking it as opened"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text FROM document_text WHERE id = ?", (doc_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE documents SET last_opened = ? WHERE id = ?", (time.time(), doc_id)
+            )
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def load_page_offsets(self, doc_id: int) -> List[int]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_offsets FROM document_text WHERE id = ?", (doc_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else [0]
+
+    def load_index(self, doc_id: int, text: Optional[str] = None) -> Optional[TextIndex]:
+        """Return a document's TextIndex, rebuilding it if the stored one is unreadable
+
+        Pass the text when it is already loaded to avoid reading it again.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text_index, page_offsets FROM document_text WHERE id = ?", (doc_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        data, page_offsets = row
+        try:
+            return TextIndex.from_bytes(data)
+        except Exception as e:
+            print(f"Error reading text index: {e}")
+        if text is None:
+            text = self.load_text(doc_id)
+            if text is None:
+                return None
+        index = TextIndex.build(text, json.loads(page_offsets))
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE document_text SET text_index = ? WHERE id = ?", (index.to_bytes(), doc_id)
+            )
+        return index
+
+    def set_position(self, doc_id: int, position: int):
+        """Record the character offset where reading stopped"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE documents SET last_position = ? WHERE id = ?", (position, doc_id)
+            )
+
+    def remove_document(self, doc_id: int):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
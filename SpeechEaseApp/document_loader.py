@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import metrics
+from document_processor import DocumentProcessor
+
+
+class DocumentLoader:
+    """Extract a document on a background thread with progress and cancellation.
+
+    Callbacks run on the loader thread:
+      on_progress(done, total)  after every page or block of text
+      on_partial(text)          once, when the first `first_parts` pages are in
+      on_done(result)           with (text, page_offsets), or None on failure
+    Nothing is reported after cancel(). Cache hits complete immediately, and a
+    finished extraction is stored in the cache and search index like
+    DocumentProcessor.extract_document would.
+    """
+
+    def __init__(self, file_path: str,
+                 on_done: Callable[[Optional[Tuple[str, List[int]]]], None],
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 on_partial: Optional[Callable[[str], None]] = None,
+                 first_parts: int = 5):
+        self.file_path = file_path
+        self.on_done = on_done
+        self.on_progress = on_progress
+        self.on_partial = on_partial
+        self.first_parts = first_parts
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="document-loader")
+        self._thread.daemon = True
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            result = self._load()
+        except Exception as e:
+            print(f"Error loading document: {e}")
+            result = None
+        outcome = "cancelled" if self.cancelled else ("loaded" if result else "failed")
+        metrics.observe("speechease_document_load_seconds", time.perf_counter() - started,
+                        format=os.path.splitext(self.file_path)[1].lower().lstrip('.'),
+                        outcome=outcome)
+        if not self.cancelled:
+            try:
+                self.on_done(result)
+            except Exception as e:
+                print(f"Error finishing document load: {e}")
+
+    def _load(self) -> Optional[Tuple[str, List[int]]]:
+        if not DocumentProcessor.is_supported(self.file_path):
+            return None
+        key, cached = DocumentProcessor.lookup_cache(self.file_path)
+        if cached is not None:
+            DocumentProcessor.remember(self.file_path, cached)
+            return cached
+
+        is_pdf = os.path.splitext(self.file_path)[1].lower() == '.pdf'
+        # PDF pages are joined with newlines; other formats' parts
+        # concatenate as they are
+        separator = "\n" if is_pdf else ""
+        parts = []
+        for done, total, text in DocumentProcessor.iter_document_parts(self.file_path):
+            if self.cancelled:
+                return None
+            parts.append(text)
+            if self.on_progress:
+                self.on_progress(done, total)
+            if self.on_partial and len(parts) == self.first_parts and done < total:
+                self.on_partial(separator.join(parts).strip())
+
+        if is_pdf:
+            result = DocumentProcessor.join_pages(parts)
+        else:
+            result = ("".join(parts).strip(), [0])
+        DocumentProcessor.remember(self.file_path, result, key)
+        return result
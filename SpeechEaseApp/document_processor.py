@@ -1,59 +1,367 @@
 import os
-from typing import Optional
-import PyPDF2
-from docx import Document
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+import metrics
+from docx_reader import iter_docx_blocks, iter_docx_paragraphs
+from extraction_cache import ExtractionCache
+from pdf_classifier import classify_pdf, extract_page
+from search_index import SearchIndex
+from text_reader import iter_text_blocks
+
+# PyPDF2 and python-docx are imported where they are used, so importing
+# this module (and starting the app) does not pay for parsers that may
+# never be needed.
+
+def _extract_pdf_page_range(file_path: str, start: int,
+                            stop: int) -> Tuple[List[str], List[str]]:
+    """Extract pages [start, stop) with a reader owned by this worker process
+
+    Returns the page texts and page kinds.
+    """
+    import PyPDF2
+    kinds: List[str] = []
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        texts = [extract_page(pdf_reader.pages[i], kinds) for i in range(start, stop)]
+    return texts, kinds
+
+def _read_docx_with_python_docx(file_path: str) -> str:
+    """Fallback DOCX extraction for files the streaming reader cannot parse"""
+    from docx import Document
+    doc = Document(file_path)
+    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
 
 class DocumentProcessor:
+    # Parallel PDF extraction is opt-in and only kicks in for documents
+    # with at least this many pages; smaller ones are not worth the
+    # process start-up cost.
+    PARALLEL_MIN_PAGES = 200
+    # None lets ProcessPoolExecutor use one worker per CPU.
+    PARALLEL_WORKERS: Optional[int] = None
+    SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+    # Shared on-disk extraction cache, opened by get_cache() on first use.
+    # Assign an ExtractionCache to relocate it, or False to disable it.
+    cache = None
+    # Full-text index every extracted document is added to, opened by
+    # get_search_index() on first use. Same conventions as `cache`.
+    search_index = None
+
+    @staticmethod
+    def iter_pdf_pages(file_path: str, use_cache: bool = True) -> Iterator[Tuple[int, str]]:
+        """Yield (page_no, text) for each PDF page as soon as it is extracted.
+
+        Page numbers start at 1. Pages without a text layer (scans, blank
+        pages) are recognised from their content stream and yield "" without
+        running text extraction; once every page has been read, the page
+        map is remembered for page_map() unless `use_cache` is off. Errors
+        are raised to the caller so that a partially read document is never
+        mistaken for a complete one.
+        """
+        import PyPDF2
+        kinds: List[str] = []
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page_no, page in enumerate(pdf_reader.pages, start=1):
+                yield page_no, extract_page(page, kinds)
+        if use_cache:
+            DocumentProcessor.remember_page_map(file_path, kinds)
+
+    @staticmethod
+    def extract_pdf_pages_parallel(file_path: str, workers: Optional[int] = None,
+                                   page_count: Optional[int] = None,
+                                   use_cache: bool = True) -> List[str]:
+        """Extract all PDF pages across a process pool, returned in page order"""
+        import PyPDF2
+        if page_count is None:
+            with open(file_path, 'rb') as file:
+                page_count = len(PyPDF2.PdfReader(file).pages)
+        workers = workers or DocumentProcessor.PARALLEL_WORKERS or os.cpu_count() or 1
+        # One contiguous range per worker: each range pays for opening and
+        # indexing the PDF again, so finer splits cost more than they save.
+        step = max(1, -(-page_count // workers))
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        pages: List[str] = []
+        kinds: List[str] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_extract_pdf_page_range, file_path, start, stop)
+                       for start, stop in ranges]
+            for future in futures:
+                range_pages, range_kinds = future.result()
+                pages.extend(range_pages)
+                kinds.extend(range_kinds)
+        if use_cache:
+            DocumentProcessor.remember_page_map(file_path, kinds)
+        return pages
+
+    @staticmethod
+    def extract_pdf_pages(file_path: str, parallel: bool = False,
+                          workers: Optional[int] = None,
+                          min_pages: Optional[int] = None,
+                          use_cache: bool = True) -> List[str]:
+        """Extract the text of every PDF page, in page order
+
+        With parallel=True, documents of at least min_pages pages (default
+        PARALLEL_MIN_PAGES) are split across a process pool of `workers`
+        processes (default PARALLEL_WORKERS). The page map is only stored
+        in the cache with `use_cache`.
+        """
+        if parallel:
+            import PyPDF2
+            if min_pages is None:
+                min_pages = DocumentProcessor.PARALLEL_MIN_PAGES
+            with open(file_path, 'rb') as file:
+                page_count = len(PyPDF2.PdfReader(file).pages)
+            if page_count >= min_pages:
+                return DocumentProcessor.extract_pdf_pages_parallel(
+                    file_path, workers, page_count, use_cache)
+        return [text for _, text in DocumentProcessor.iter_pdf_pages(file_path, use_cache)]
+
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> Optional[str]:
+    def join_pages(pages: List[str]) -> Tuple[str, List[int]]:
+        """Join page texts into one stripped string plus each page's start offset"""
+        offsets = []
+        position = 0
+        for text in pages:
+            offsets.append(position)
+            position += len(text) + 1
+        joined = "\n".join(pages)
+        text = joined.strip()
+        leading = len(joined) - len(joined.lstrip())
+        return text, [min(max(0, offset - leading), len(text)) for offset in offsets]
+
+    @staticmethod
+    def extract_text_from_pdf(file_path: str, parallel: bool = False,
+                              workers: Optional[int] = None,
+                              min_pages: Optional[int] = None,
+                              use_cache: bool = True) -> Optional[str]:
         """Extract text from PDF file"""
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
+            pages = DocumentProcessor.extract_pdf_pages(
+                file_path, parallel, workers, min_pages, use_cache)
+            return DocumentProcessor.join_pages(pages)[0]
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return None
     
     @staticmethod
     def extract_text_from_docx(file_path: str) -> Optional[str]:
-        """Extract text from DOCX file"""
+        """Extract text from DOCX file
+
+        Paragraphs and table cells are streamed straight from the package
+        XML (see docx_reader); python-docx is the fallback for files that
+        path cannot read.
+        """
         try:
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "\n".join(iter_docx_paragraphs(file_path)).strip()
+        except Exception as e:
+            print(f"Fast DOCX extraction failed, retrying with python-docx: {e}")
+        try:
+            return _read_docx_with_python_docx(file_path)
         except Exception as e:
             print(f"Error reading DOCX: {e}")
             return None
     
     @staticmethod
     def extract_text_from_txt(file_path: str) -> Optional[str]:
-        """Extract text from TXT file"""
+        """Extract text from TXT file, detecting its encoding
+
+        Use text_reader.iter_text_blocks directly to process large files
+        without holding the whole text.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read().strip()
+            return "".join(block for _, _, block in iter_text_blocks(file_path)).strip()
         except Exception as e:
             print(f"Error reading TXT: {e}")
             return None
     
     @staticmethod
-    def process_document(file_path: str) -> Optional[str]:
-        """Process document based on file extension"""
-        if not os.path.exists(file_path):
+    def get_cache() -> Optional[ExtractionCache]:
+        """Return the shared extraction cache, opening it on first use"""
+        if DocumentProcessor.cache is None:
+            try:
+                DocumentProcessor.cache = ExtractionCache()
+            except Exception as e:
+                print(f"Error opening extraction cache: {e}")
+                DocumentProcessor.cache = False
+        return DocumentProcessor.cache or None
+
+    @staticmethod
+    def get_search_index() -> Optional[SearchIndex]:
+        """Return the shared search index, opening it on first use"""
+        if DocumentProcessor.search_index is None:
+            try:
+                DocumentProcessor.search_index = SearchIndex()
+            except Exception as e:
+                print(f"Error opening search index: {e}")
+                DocumentProcessor.search_index = False
+        return DocumentProcessor.search_index or None
+
+    @staticmethod
+    def lookup_cache(file_path: str) -> Tuple[Optional[str], Optional[Tuple[str, List[int]]]]:
+        """Return (cache key, cached (text, page_offsets)) for a file; either may be None"""
+        cache = DocumentProcessor.get_cache()
+        if cache is None:
+            return None, None
+        try:
+            key = cache.file_key(file_path)
+            return key, cache.load(key)
+        except Exception as e:
+            print(f"Error reading extraction cache: {e}")
+            return None, None
+
+    @staticmethod
+    def remember(file_path: str, result: Tuple[str, List[int]],
+                 key: Optional[str] = None, index: bool = True):
+        """Store an extraction in the cache (when key is given) and the search index"""
+        cache = DocumentProcessor.get_cache()
+        if cache is not None and key is not None:
+            try:
+                cache.store(key, *result)
+            except Exception as e:
+                print(f"Error writing extraction cache: {e}")
+        if index and result[0]:
+            search_index = DocumentProcessor.get_search_index()
+            if search_index is not None:
+                try:
+                    search_index.add_document(os.path.basename(file_path), file_path, *result)
+                except Exception as e:
+                    print(f"Error updating search index: {e}")
+
+    @staticmethod
+    def remember_page_map(file_path: str, kinds: List[str]):
+        """Store a PDF's page classification in the cache"""
+        cache = DocumentProcessor.get_cache()
+        if cache is None:
+            return
+        try:
+            cache.store_page_kinds(cache.file_key(file_path), kinds)
+        except Exception as e:
+            print(f"Error writing extraction cache: {e}")
+
+    @staticmethod
+    def page_map(file_path: str) -> List[str]:
+        """Return the kind of each page (see pdf_classifier), or [] for non-PDFs
+
+        Playback and the UI can use this to announce or skip pages that
+        have no text layer. Served from the cache when the document has
+        been classified before.
+        """
+        if os.path.splitext(file_path)[1].lower() != '.pdf':
+            return []
+        cache = DocumentProcessor.get_cache()
+        key = None
+        if cache is not None:
+            try:
+                key = cache.file_key(file_path)
+                kinds = cache.load_page_kinds(key)
+                if kinds is not None:
+                    return kinds
+            except Exception as e:
+                print(f"Error reading extraction cache: {e}")
+        try:
+            kinds = classify_pdf(file_path)
+        except Exception as e:
+            print(f"Error reading PDF: {e}")
+            return []
+        if key is not None:
+            try:
+                cache.store_page_kinds(key, kinds)
+            except Exception as e:
+                print(f"Error writing extraction cache: {e}")
+        return kinds
+
+    @staticmethod
+    def is_supported(file_path: str) -> bool:
+        file_ext = os.path.splitext(file_path)[1].lower()
+        return os.path.exists(file_path) and file_ext in DocumentProcessor.SUPPORTED_EXTENSIONS
+
+    @staticmethod
+    def iter_document_parts(file_path: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (done, total, text) while a document is extracted, for progress reporting
+
+        PDFs yield one part per page, to be joined with newlines (see
+        join_pages). TXT and DOCX files are streamed as paragraph-aligned
+        blocks that concatenate to the text, with done/total counted in
+        bytes (of the file, or of the DOCX XML). A DOCX the streaming reader
+        cannot parse arrives as a single part. Errors are raised to the
+        caller.
+        """
+        file_ext = os.path.splitext(file_path)[1].lower()
+        if file_ext == '.pdf':
+            import PyPDF2
+            with open(file_path, 'rb') as file:
+                total = len(PyPDF2.PdfReader(file).pages)
+            for page_no, text in DocumentProcessor.iter_pdf_pages(file_path):
+                yield page_no, total, text
+            return
+        if file_ext == '.txt':
+            yield from iter_text_blocks(file_path)
+            return
+        streamed = False
+        try:
+            for part in iter_docx_blocks(file_path):
+                streamed = True
+                yield part
+            return
+        except Exception as e:
+            # Blocks already handed out cannot be taken back
+            if streamed:
+                raise
+            print(f"Fast DOCX extraction failed, retrying with python-docx: {e}")
+        yield 1, 1, _read_docx_with_python_docx(file_path)
+
+    @staticmethod
+    def extract_document(file_path: str, parallel: bool = False,
+                         use_cache: bool = True,
+                         index: bool = True) -> Optional[Tuple[str, List[int]]]:
+        """Return (text, page_offsets) for a document, served from cache when possible
+
+        page_offsets holds the character offset where each page starts;
+        formats without pages report a single page at offset 0. With
+        `index`, the document is added to the search index if it is new.
+        """
+        if not DocumentProcessor.is_supported(file_path):
             return None
         
         file_ext = os.path.splitext(file_path)[1].lower()
-        
-        if file_ext == '.pdf':
-            return DocumentProcessor.extract_text_from_pdf(file_path)
-        elif file_ext == '.docx':
-            return DocumentProcessor.extract_text_from_docx(file_path)
-        elif file_ext == '.txt':
-            return DocumentProcessor.extract_text_from_txt(file_path)
+        started = time.perf_counter()
+        key, result = DocumentProcessor.lookup_cache(file_path) if use_cache else (None, None)
+        if result is None:
+            if file_ext == '.pdf':
+                try:
+                    pages = DocumentProcessor.extract_pdf_pages(
+                        file_path, parallel=parallel, use_cache=use_cache)
+                except Exception as e:
+                    print(f"Error reading PDF: {e}")
+                    pages = None
+                result = DocumentProcessor.join_pages(pages) if pages is not None else None
+            else:
+                if file_ext == '.docx':
+                    text = DocumentProcessor.extract_text_from_docx(file_path)
+                else:
+                    text = DocumentProcessor.extract_text_from_txt(file_path)
+                result = (text, [0]) if text is not None else None
+            source = "extracted" if result is not None else "failed"
         else:
+            # Already cached; remember() only needs to make sure it is indexed
+            key = None
+            source = "cache"
+        metrics.observe("speechease_extraction_seconds", time.perf_counter() - started,
+                        format=file_ext.lstrip('.'), source=source)
+        if result is None:
             return None
+        
+        DocumentProcessor.remember(file_path, result, key, index)
+        return result
+    
+    @staticmethod
+    def process_document(file_path: str, parallel: bool = False,
+                         use_cache: bool = True) -> Optional[str]:
+        """Process document based on file extension
+
+        `parallel` enables multi-process extraction for large PDFs and
+        `use_cache` serves previously extracted files from ExtractionCache.
+        """
+        result = DocumentProcessor.extract_document(file_path, parallel, use_cache)
+        return result[0] if result else None
@@ -0,0 +1,203 @@
+import threading
+from typing import Optional
+import flet as ft
+from text_chunker import MAX_CHUNK_CHARS, chunk_at, split_into_chunks
+from text_index import TextIndex
+
+
+class DocumentReader:
+    """Virtualized, scrollable view of a long document.
+
+    The text is split into paragraph blocks, but only a window of them is
+    turned into controls. More blocks are materialized as the user nears
+    either end of the list. Once more than max_blocks are live, the far end
+    is trimmed, so the client never holds the whole document and each
+    update ships only the blocks that changed. Given the text's TextIndex,
+    built with the same chunk size as block_chars, its paragraphs are used
+    as the blocks instead of splitting the text.
+
+    highlight() is called from the speech thread while scrolling runs on
+    Flet's event threads, so the window (first, last and the live controls)
+    is only read or changed while holding the reader's lock.
+    """
+
+    def __init__(self, text: str, font_size: int, color: str,
+                 highlight_color: str = ft.colors.YELLOW_200,
+                 window: int = 40, buffer: int = 20, max_blocks: int = 160,
+                 block_chars: int = MAX_CHUNK_CHARS, index: Optional[TextIndex] = None):
+        self.text = text
+        self.font_size = font_size
+        self.color = color
+        self.highlight_color = highlight_color
+        # (block index, start, end) of the word being read, if any
+        self.highlighted = None
+        self.window = window
+        self.buffer = buffer
+        self.max_blocks = max_blocks
+        self.block_chars = block_chars
+        self._lock = threading.RLock()
+        self.blocks = self._split(text, index)
+        self.first = 0
+        self.last = 0
+        self.list_view = ft.ListView(
+            expand=True,
+            spacing=10,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=100,
+        )
+        self._materialize(0)
+
+    def _split(self, text: str, index: Optional[TextIndex]):
+        if (index is not None and index.length == len(text)
+                and index.max_chars == self.block_chars):
+            return index.paragraphs
+        return split_into_chunks(text, "paragraph", max_chars=self.block_chars)
+
+    def _block_control(self, index: int) -> ft.Text:
+        control = ft.Text(
+            size=self.font_size,
+            selectable=True,
+            color=self.color,
+            key=f"block-{index}",
+            data=index,
+        )
+        self._set_block_text(control)
+        return control
+
+    def _set_block_text(self, control: ft.Text):
+        """Fill a block with plain text, or with spans around the highlighted word"""
+        index = control.data
+        start, end = self.blocks[index]
+        if self.highlighted is None or self.highlighted[0] != index:
+            control.value = self.text[start:end]
+            control.spans = []
+            return
+        _, word_start, word_end = self.highlighted
+        control.value = None
+        control.spans = [
+            ft.TextSpan(self.text[start:word_start]),
+            ft.TextSpan(
+                self.text[word_start:word_end],
+                style=ft.TextStyle(bgcolor=self.highlight_color),
+            ),
+            ft.TextSpan(self.text[word_end:end]),
+        ]
+
+    def _live_control(self, index: int):
+        if self.first <= index < self.last:
+            return self.list_view.controls[index - self.first]
+        return None
+
+    def highlight(self, offset: int, length: int) -> bool:
+        """Highlight a span of text, updating only the affected blocks
+
+        Returns True when the highlight moved into a different block.
+        """
+        with self._lock:
+            previous = self.highlighted
+            if not self.blocks:
+                return False
+            index = self.block_at(offset)
+            start, end = self.blocks[index]
+            word_start = max(start, min(offset, end))
+            word_end = max(word_start, min(offset + length, end))
+            self.highlighted = (index, word_start, word_end)
+            changed = []
+            for block in {index, previous[0] if previous else index}:
+                control = self._live_control(block)
+                if control is not None:
+                    self._set_block_text(control)
+                    changed.append(control)
+            if changed and self.list_view.page is not None:
+                self.list_view.page.update(*changed)
+            return previous is None or previous[0] != index
+
+    def clear_highlight(self):
+        with self._lock:
+            previous = self.highlighted
+            self.highlighted = None
+            if previous is None:
+                return
+            control = self._live_control(previous[0])
+            if control is not None:
+                self._set_block_text(control)
+                if control.page is not None:
+                    control.update()
+
+    def _materialize(self, first: int):
+        """Replace the live blocks with a fresh window starting at first"""
+        self.first = max(0, min(first, len(self.blocks) - 1))
+        self.last = min(self.first + self.window, len(self.blocks))
+        self.list_view.controls = [self._block_control(i) for i in range(self.first, self.last)]
+
+    def _extend_forward(self):
+        new_last = min(self.last + self.buffer, len(self.blocks))
+        self.list_view.controls.extend(self._block_control(i) for i in range(self.last, new_last))
+        anchor = self.last - 1
+        self.last = new_last
+        excess = (self.last - self.first) - self.max_blocks
+        if excess > 0:
+            del self.list_view.controls[:excess]
+            self.first += excess
+            self.list_view.update()
+            # Trimming the top shifts the scroll offset; pin the view back to
+            # the block that was at the bottom edge before extending
+            self.list_view.scroll_to(key=f"block-{anchor}")
+        else:
+            self.list_view.update()
+
+    def _extend_backward(self):
+        anchor = self.first
+        new_first = max(0, self.first - self.buffer)
+        self.list_view.controls[0:0] = [self._block_control(i) for i in range(new_first, self.first)]
+        self.first = new_first
+        excess = (self.last - self.first) - self.max_blocks
+        if excess > 0:
+            del self.list_view.controls[-excess:]
+            self.last -= excess
+        self.list_view.update()
+        self.list_view.scroll_to(key=f"block-{anchor}")
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent is None or e.pixels is None:
+            return
+        with self._lock:
+            if e.pixels >= e.max_scroll_extent - 400 and self.last < len(self.blocks):
+                self._extend_forward()
+            elif e.pixels <= 200 and self.first > 0:
+                self._extend_backward()
+
+    def block_at(self, offset: int) -> int:
+        """Return the index of the block containing a character offset"""
+        return min(chunk_at(self.blocks, offset), len(self.blocks) - 1)
+
+    def scroll_to_offset(self, offset: int, duration: int = 300):
+        """Scroll so the block containing a character offset is visible"""
+        with self._lock:
+            if not self.blocks:
+                return
+            index = self.block_at(offset)
+            if not self.first <= index < self.last:
+                self._materialize(index - self.buffer)
+                self.list_view.update()
+        self.list_view.scroll_to(key=f"block-{index}", duration=duration)
+
+    def set_text(self, text: str, index: Optional[TextIndex] = None):
+        """Swap in new text, e.g. the rest of a document that was still loading"""
+        blocks = self._split(text, index)
+        with self._lock:
+            self.text = text
+            self.blocks = blocks
+            self.highlighted = None
+            self._materialize(self.first)
+            if self.list_view.page is not None:
+                self.list_view.update()
+
+    def set_font_size(self, font_size: int):
+        """Resize the live blocks in place; later blocks pick up the new size"""
+        with self._lock:
+            self.font_size = font_size
+            for control in self.list_view.controls:
+                control.size = font_size
+            if self.list_view.page is not None:
+                self.list_view.update()
@@ -0,0 +1,130 @@
+import re
+import zipfile
+from typing import Iterator, List, Tuple
+from xml.etree import ElementTree
+
+# Characters of paragraph text per block yielded by iter_docx_blocks()
+BLOCK_CHARS = 64 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_PARAGRAPH = _W + "p"
+_TEXT = _W + "t"
+# Run content that python-docx also renders as text
+_SPECIAL = {
+    _W + "tab": "\t",
+    _W + "ptab": "\t",
+    _W + "br": "\n",
+    _W + "cr": "\n",
+    _W + "noBreakHyphen": "-",
+}
+_HEADER = re.compile(r"word/header\d*\.xml$")
+_FOOTER = re.compile(r"word/footer\d*\.xml$")
+
+
+class _CountingReader:
+    """Binary stream wrapper that counts the bytes read through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.count += len(data)
+        return data
+
+
+def _iter_stream_paragraphs(stream) -> Iterator[str]:
+    # Text for each open paragraph (text boxes nest paragraphs)
+    open_paragraphs: List[List[str]] = []
+    depth = 0
+    container = None
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 2:
+                # <w:body>, <w:hdr>, <w:ftr>, <w:footnotes>...
+                container = element
+            if element.tag == _PARAGRAPH:
+                open_paragraphs.append([])
+            continue
+        depth -= 1
+        tag = element.tag
+        if open_paragraphs:
+            if tag == _TEXT:
+                open_paragraphs[-1].append(element.text or "")
+            elif tag in _SPECIAL:
+                open_paragraphs[-1].append(_SPECIAL[tag])
+        if tag == _PARAGRAPH:
+            yield "".join(open_paragraphs.pop())
+        if depth == 2 and container is not None:
+            # A top-level block is finished; drop it from the tree
+            container.clear()
+
+
+def iter_part_paragraphs(docx: zipfile.ZipFile, part: str) -> Iterator[str]:
+    """Yield the text of each paragraph in one XML part, in document order
+
+    The part is parsed incrementally and finished elements are released,
+    so memory stays proportional to a single top-level block rather than
+    the whole document. Table cells are paragraphs too and come out row
+    by row; paragraphs nested in text boxes come out before the paragraph
+    that contains them. Deleted text and field codes are skipped.
+    """
+    with docx.open(part) as stream:
+        yield from _iter_stream_paragraphs(stream)
+
+
+def _text_parts(names: List[str], headers_footers: bool, notes: bool) -> List[str]:
+    """The XML parts holding text, in reading order"""
+    parts = []
+    if headers_footers:
+        parts += sorted(name for name in names if _HEADER.match(name))
+    parts.append("word/document.xml")
+    if notes:
+        parts += [name for name in ("word/footnotes.xml", "word/endnotes.xml") if name in names]
+    if headers_footers:
+        parts += sorted(name for name in names if _FOOTER.match(name))
+    return parts
+
+
+def iter_docx_paragraphs(file_path: str, headers_footers: bool = False,
+                         notes: bool = False) -> Iterator[str]:
+    """Yield paragraph texts of a DOCX file straight from its XML, in reading order
+
+    Headers come before and footers after the body when `headers_footers`
+    is set, and footnotes and endnotes follow the body when `notes` is set.
+    Raises on files that are not valid DOCX packages.
+    """
+    with zipfile.ZipFile(file_path) as docx:
+        for part in _text_parts(docx.namelist(), headers_footers, notes):
+            yield from iter_part_paragraphs(docx, part)
+
+
+def iter_docx_blocks(file_path: str, headers_footers: bool = False, notes: bool = False,
+                     block_chars: int = BLOCK_CHARS) -> Iterator[Tuple[int, int, str]]:
+    """Yield (bytes_parsed, total_bytes, text) blocks of a DOCX file's paragraphs
+
+    Blocks hold whole paragraphs, each followed by a newline, so they
+    concatenate to the paragraphs of iter_docx_paragraphs() joined with
+    newlines (plus a trailing one). Progress counts the uncompressed XML
+    parsed so far; the last block reports total_bytes and may be empty.
+    """
+    with zipfile.ZipFile(file_path) as docx:
+        parts = _text_parts(docx.namelist(), headers_footers, notes)
+        total = sum(docx.getinfo(part).file_size for part in parts)
+        done = 0
+        block: List[str] = []
+        size = 0
+        for part in parts:
+            with docx.open(part) as stream:
+                reader = _CountingReader(stream)
+                for paragraph in _iter_stream_paragraphs(reader):
+                    block.append(paragraph + "\n")
+                    size += len(paragraph) + 1
+                    if size >= block_chars:
+                        yield min(done + reader.count, total), total, "".join(block)
+                        block = []
+                        size = 0
+            done += docx.getinfo(part).file_size
+        yield total, total, "".join(block)
@@ -0,0 +1,59 @@
+import threading
+import time
+from typing import Any, Callable
+
+
+class Throttle:
+    """Coalesce a stream of events into at most max_per_second handler calls.
+
+    submit() only records the latest value. The handler is called right away
+    if the last call was long enough ago, otherwise once the interval has
+    elapsed with whatever value is newest by then, so intermediate events
+    are dropped but the final one is always delivered.
+    """
+
+    def __init__(self, handler: Callable[[Any], None], max_per_second: float = 8):
+        self.handler = handler
+        self.interval = 1.0 / max_per_second
+        self._lock = threading.Lock()
+        self._pending: Any = None
+        self._has_pending = False
+        self._last_call = 0.0
+        self._timer = None
+
+    def submit(self, value: Any):
+        with self._lock:
+            self._pending = value
+            self._has_pending = True
+            if self._timer is not None:
+                return
+            wait = self._last_call + self.interval - time.monotonic()
+            if wait > 0:
+                self._timer = threading.Timer(wait, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self._flush()
+
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            if not self._has_pending:
+                return
+            value = self._pending
+            self._pending = None
+            self._has_pending = False
+            self._last_call = time.monotonic()
+        try:
+            self.handler(value)
+        except Exception as e:
+            print(f"Error in throttled handler: {e}")
+
+    def cancel(self):
+        """Drop any pending event"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = None
+            self._has_pending = False
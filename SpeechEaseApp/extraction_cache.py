@@ -0,0 +1,198 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".speechease", "cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def hash_file(file_path: str, block_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Persistent, size-bounded LRU cache of extracted document text.
+
+    Entries are keyed by the SHA-256 of the source file, so a renamed or
+    copied document still hits and an edited one never does. A side table
+    remembers (path, size, mtime) -> hash, which lets an unchanged file skip
+    re-hashing; any change in size or mtime falls back to hashing the
+    content. Text is stored zlib-compressed together with page start
+    offsets, and the least recently used entries are evicted once the
+    compressed total exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.db_path = os.path.join(cache_dir, "extraction_cache.db")
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " hash TEXT PRIMARY KEY, text BLOB NOT NULL, page_offsets TEXT NOT NULL,"
+                " nbytes INTEGER NOT NULL, created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS paths ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL, hash TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS page_kinds ("
+                " hash TEXT PRIMARY KEY, kinds TEXT NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def file_key(self, file_path: str, verify: bool = False) -> str:
+        """Return the content hash for file_path, re-hashing only if it changed"""
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        if not verify:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT hash FROM paths WHERE path = ? AND size = ? AND mtime_ns = ?",
+                    (path, stat.st_size, stat.st_mtime_ns),
+                ).fetchone()
+            if row:
+                return row[0]
+        key = hash_file(path)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO paths (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, key),
+            )
+        return key
+
+    def load(self, key: str) -> Optional[Tuple[str, List[int]]]:
+        """Return (text, page_offsets) for a key, or None on a miss"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, page_offsets FROM entries WHERE hash = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE hash = ?", (time.time(), key))
+        return zlib.decompress(row[0]).decode('utf-8'), json.loads(row[1])
+
+    def store(self, key: str, text: str, page_offsets: List[int]):
+        """Store extracted text for a key and evict old entries if over budget"""
+        blob = zlib.compress(text.encode('utf-8'), 1)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (hash, text, page_offsets, nbytes, created, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, json.dumps(page_offsets), len(blob), now, now),
+            )
+            self._evict(conn)
+
+    def load_page_kinds(self, key: str) -> Optional[List[str]]:
+        """Return the per-page classification stored for a key (see pdf_classifier)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT kinds FROM page_kinds WHERE hash = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_page_kinds(self, key: str, kinds: List[str]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO page_kinds (hash, kinds) VALUES (?, ?)",
+                (key, json.dumps(kinds)),
+            )
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, nbytes in conn.execute(
+            "SELECT hash, nbytes FROM entries ORDER BY last_access"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE hash = ?", (key,))
+            conn.execute("DELETE FROM paths WHERE hash = ?", (key,))
+            conn.execute("DELETE FROM page_kinds WHERE hash = ?", (key,))
+            total -= nbytes
+
+    def entries(self) -> List[dict]:
+        """Return metadata for all entries, most recently used first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT e.hash, e.nbytes, e.created, e.last_access, e.page_offsets,"
+                " (SELECT p.path FROM paths p WHERE p.hash = e.hash LIMIT 1)"
+                " FROM entries e ORDER BY e.last_access DESC"
+            ).fetchall()
+        return [
+            {
+                "hash": key,
+                "bytes": nbytes,
+                "created": created,
+                "last_access": last_access,
+                "pages": len(json.loads(page_offsets)),
+                "path": path,
+            }
+            for key, nbytes, created, last_access, page_offsets, path in rows
+        ]
+
+    def total_bytes(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries").fetchone()[0]
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM paths")
+            conn.execute("DELETE FROM page_kinds")
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
+            conn.execute("VACUUM")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect or clear the SpeechEase extraction cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("info", help="show cache location and size")
+    subparsers.add_parser("list", help="list cached documents")
+    subparsers.add_parser("clear", help="delete all cached documents")
+    args = parser.parse_args(argv)
+
+    cache = ExtractionCache(args.cache_dir)
+    if args.command == "info":
+        entries = cache.entries()
+        print(f"Cache: {cache.db_path}")
+        print(f"Entries: {len(entries)}")
+        print(f"Size: {cache.total_bytes() / 1024:.1f} KiB of {cache.max_bytes / 1024 / 1024:.0f} MiB")
+    elif args.command == "list":
+        for entry in cache.entries():
+            last_used = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_access"]))
+            print(f"{entry['hash'][:12]}  {entry['bytes'] / 1024:>9.1f} KiB  "
+                  f"{entry['pages']:>5} pages  {last_used}  {entry['path'] or '-'}")
+    elif args.command == "clear":
+        cache.clear()
+        print("Extraction cache cleared")
+
+
+if __name__ == "__main__":
+    main()
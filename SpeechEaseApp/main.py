@@ -2,16 +2,47 @@ import flet as ft
 import asyncio
 from typing import Optional
 import os
-import json
-from datetime import datetime
-from tts_engine import TTSEngine
+import shutil
+import threading
+import urllib.parse
+import uuid
+from tts_engine import IDLE, SPEAKING, TTSEngine
+from tts_pool import get_shared_pool
+from browser_player import BrowserPlayer
 from document_processor import DocumentProcessor
+from audio_exporter import AudioExporter
+from document_reader import DocumentReader
+from event_throttle import Throttle
+from settings_store import get_settings_store
+from document_library import DocumentLibrary
+from document_loader import DocumentLoader
+from pdf_classifier import HAS_TEXT, pages_without_text
+from text_index import TextIndex
+import metrics
+
+# Served by Flet's web server; web exports are written under it
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+EXPORTS_DIR = os.path.join(ASSETS_DIR, "exports")
+# Seconds a web export stays downloadable before it is deleted
+EXPORT_TTL = 15 * 60
+
+HIGHLIGHT_COLORS = {
+    "yellow": ft.colors.YELLOW_200,
+    "blue": ft.colors.LIGHT_BLUE_200,
+    "green": ft.colors.LIGHT_GREEN_200,
+    "pink": ft.colors.PINK_100,
+}
 
 class SpeechEaseAppEnhanced:
     def __init__(self):
         self.page: Optional[ft.Page] = None
         self.current_view = "home"
-        self.tts_engine = TTSEngine()
+        # Added to this session's metrics (see metrics.timed_method)
+        self.metrics_labels = {}
+        # Sessions share the process-wide driver pool instead of each
+        # starting a speech driver of their own
+        self.tts_engine = TTSEngine(pool=get_shared_pool())
+        self.tts_engine.on_state_change = self.on_tts_state_change
         self.settings = {
             "dark_mode": False,
             "auto_scroll": True,
@@ -24,10 +55,37 @@ class SpeechEaseAppEnhanced:
             "highlight_color": "yellow",
             "volume": 0.8
         }
-        self.recent_documents = []
+        self.settings_store = get_settings_store("settings.json")
+        self.library = DocumentLibrary()
         self.is_playing = False
         self.current_text = ""
         self.current_document = None
+        # Sentence, paragraph and page offsets of the current text, for
+        # seeking without rescanning it; None while a document is loading
+        self.text_index: Optional[TextIndex] = None
+        # Page the last highlighted word was on, to announce pages without
+        # text that playback passes over; None until a word is highlighted
+        self.spoken_page: Optional[int] = None
+        self.document_reader: Optional[DocumentReader] = None
+        # The document view is built once per document (and theme) and kept,
+        # along with the controls that handlers update in place.
+        self.document_view: Optional[ft.Control] = None
+        self.play_button: Optional[ft.IconButton] = None
+        self.speed_slider: Optional[ft.Slider] = None
+        self.volume_slider: Optional[ft.Slider] = None
+        # Word events arrive far faster than the client should be updated;
+        # only the latest word is drawn, at most 8 times a second
+        self.highlight_throttle = Throttle(self.apply_highlight, max_per_second=8)
+        # Background extraction of the document being opened, if any
+        self.loader: Optional[DocumentLoader] = None
+        self.load_row: Optional[ft.Row] = None
+        self.load_progress: Optional[ft.ProgressBar] = None
+        self.progress_throttle = Throttle(self.apply_load_progress, max_per_second=4)
+        # Web export directories of this session, with the timer that deletes
+        # each once it has been offered for download; whatever is left goes
+        # when the session closes
+        self.exports = {}
+        self.exports_lock = threading.Lock()
         
     def main(self, page: ft.Page):
         self.page = page
@@ -38,6 +96,17 @@ class SpeechEaseAppEnhanced:
         page.window_min_width = 800
         page.window_min_height = 600
         page.padding = 0
+        page.on_disconnect = lambda e: self.settings_store.flush()
+        page.on_close = self.on_session_closed
+        self.metrics_labels = {"session": page.session_id}
+        self.tts_engine.metrics_labels = self.metrics_labels
+        if metrics.enabled():
+            page.update = metrics.timed("speechease_page_update_seconds",
+                                        **self.metrics_labels)(page.update)
+        if page.web:
+            # The server's speakers are useless to a remote user; stream
+            # each rendered chunk to their browser instead
+            self.tts_engine.player = BrowserPlayer(page)
         
         # Load settings and apply TTS settings
         self.load_settings()
@@ -92,6 +161,9 @@ class SpeechEaseAppEnhanced:
         )
         
         page.update()
+        # Bring the speech driver up now that the first frame is out,
+        # rather than on the first press of play
+        self.tts_engine.start()
     
     def apply_tts_settings(self):
         """Apply current settings to TTS engine"""
@@ -99,33 +171,112 @@ class SpeechEaseAppEnhanced:
         self.tts_engine.set_rate(self.settings["speed"])
         self.tts_engine.set_volume(self.settings["volume"])
     
+    @metrics.timed_method("speechease_handler_seconds", handler="file_picker_result")
     def file_picker_result(self, e: ft.FilePickerResultEvent):
         """Handle file picker result"""
         if e.files:
             file_path = e.files[0].path
-            text = DocumentProcessor.process_document(file_path)
-            if text:
-                self.current_text = text
-                self.current_document = {
-                    "name": os.path.basename(file_path),
-                    "path": file_path,
-                    "text": text,
-                    "date": datetime.now().strftime("%Y-%m-%d")
-                }
-                # Add to recent documents
-                self.recent_documents.insert(0, self.current_document)
-                if len(self.recent_documents) > 10:
-                    self.recent_documents = self.recent_documents[:10]
-                
-                # Switch to document view
-                self.nav_rail.selected_index = 1
-                self.current_view = "document"
-                self.content_area.content = self.create_document_view()
+            if self.loader is not None:
+                self.loader.cancel()
+            
+            # Extraction runs in the background; the document view opens
+            # right away and fills in as pages arrive
+            loader = DocumentLoader(
+                file_path,
+                on_done=lambda result: self.document_loaded(loader, result),
+                on_progress=lambda done, total: self.progress_throttle.submit((done, total)),
+                on_partial=lambda text: self.document_partially_loaded(loader, text),
+            )
+            self.loader = loader
+            self.current_text = ""
+            self.text_index = None
+            self.current_document = {
+                "id": None,
+                "name": os.path.basename(file_path),
+                "path": file_path,
+                "text": "",
+            }
+            
+            # Switch to document view
+            self.nav_rail.selected_index = 1
+            self.current_view = "document"
+            self.content_area.content = self.create_document_view()
+            self.page.update()
+            loader.start()
+    
+    def apply_load_progress(self, progress):
+        done, total = progress
+        if self.loader is None or self.load_progress is None:
+            return
+        self.load_progress.value = done / total if total else None
+        if self.load_progress.page is not None:
+            self.load_progress.update()
+    
+    def document_partially_loaded(self, loader, text):
+        """Show the first pages while the rest of the document is extracted"""
+        if loader is not self.loader:
+            return
+        self.current_text = text
+        self.current_document["text"] = text
+        if self.document_reader is not None:
+            self.document_reader.set_text(text)
+    
+    def document_loaded(self, loader, result):
+        if loader is not self.loader:
+            return
+        self.loader = None
+        self.progress_throttle.cancel()
+        if not result or not result[0]:
+            self.current_document = None
+            self.current_text = ""
+            self.text_index = None
+            self.create_document_view()
+            if self.current_view == "document":
+                self.content_area.content = self.document_view
                 self.page.update()
-                self.show_snackbar(f"Loaded: {self.current_document['name']}")
-            else:
-                self.show_snackbar("Failed to load document")
+            self.show_snackbar("Failed to load document")
+            return
+        
+        text, page_offsets = result
+        # Add to the library (deduplicated by content)
+        doc, self.text_index = self.library.add_document(
+            self.current_document["name"], self.current_document["path"], text, page_offsets)
+        # Kind of each PDF page; pages without a text layer add no text
+        page_kinds = self.load_page_kinds(self.current_document)
+        self.current_text = text
+        self.current_document = dict(doc, text=text, page_kinds=page_kinds)
+        if self.document_reader is not None:
+            self.document_reader.set_text(text, self.text_index)
+        self.hide_load_progress()
+        message = f"Loaded: {self.current_document['name']}"
+        skipped = sum(1 for kind in page_kinds if kind not in HAS_TEXT)
+        if skipped:
+            message += f" ({skipped} of {len(page_kinds)} pages have no text)"
+        self.show_snackbar(message)
+    
+    def cancel_loading(self, e):
+        if self.loader is None:
+            return
+        self.loader.cancel()
+        self.loader = None
+        self.progress_throttle.cancel()
+        # Pages shown so far are only part of the document and it was never
+        # added to the library; close it rather than play or export a part
+        self.current_document = None
+        self.current_text = ""
+        self.text_index = None
+        self.content_area.content = self.create_document_view()
+        self.page.update()
+        self.show_snackbar("Loading cancelled")
+    
+    def hide_load_progress(self):
+        if self.load_row is None:
+            return
+        self.load_row.visible = False
+        if self.load_row.page is not None:
+            self.load_row.update()
     
+    @metrics.timed_method("speechease_handler_seconds", handler="nav_change")
     def nav_change(self, e):
         selected_index = e.control.selected_index
         if selected_index == 0:
@@ -133,14 +284,16 @@ class SpeechEaseAppEnhanced:
             self.content_area.content = self.create_home_view()
         elif selected_index == 1:
             self.current_view = "document"
-            self.content_area.content = self.create_document_view()
+            self.content_area.content = self.get_document_view()
         elif selected_index == 2:
             self.current_view = "settings"
             self.content_area.content = self.create_settings_view()
         
         self.page.update()
     
+    @metrics.timed_method("speechease_view_build_seconds", view="home")
     def create_home_view(self):
+        self.search_results = ft.Column()
         return ft.Column([
             ft.Text(
                 "Welcome to SpeechEase",
@@ -182,6 +335,14 @@ class SpeechEaseAppEnhanced:
                     ink=True,
                 ),
             ]),
+            ft.Container(height=30),
+            ft.TextField(
+                hint_text="Search your documents",
+                prefix_icon=ft.icons.SEARCH,
+                width=620,
+                on_submit=self.search_documents,
+            ),
+            self.search_results,
             ft.Container(height=40),
             ft.Text(
                 "Recent Documents",
@@ -194,7 +355,8 @@ class SpeechEaseAppEnhanced:
         ], scroll=ft.ScrollMode.AUTO)
     
     def create_recent_documents_grid(self):
-        if not self.recent_documents:
+        recent_documents = self.library.recent_documents(10)
+        if not recent_documents:
             return ft.Text(
                 "No recent documents. Upload a document to get started!",
                 size=16,
@@ -203,11 +365,11 @@ class SpeechEaseAppEnhanced:
             )
         
         rows = []
-        for i in range(0, len(self.recent_documents), 4):
+        for i in range(0, len(recent_documents), 4):
             row_items = []
             for j in range(4):
-                if i + j < len(self.recent_documents):
-                    doc = self.recent_documents[i + j]
+                if i + j < len(recent_documents):
+                    doc = recent_documents[i + j]
                     row_items.append(
                         ft.Container(
                             content=ft.Column([
@@ -251,14 +413,23 @@ class SpeechEaseAppEnhanced:
             
             if row_items:
                 rows.append(ft.Row(row_items))
-                if i + 4 < len(self.recent_documents):
+                if i + 4 < len(recent_documents):
                     rows.append(ft.Container(height=10))
         
         return ft.Column(rows)
     
+    def get_document_view(self):
+        """Return the cached document view, building it on first use"""
+        if self.document_view is None:
+            self.create_document_view()
+        return self.document_view
+    
+    @metrics.timed_method("speechease_view_build_seconds", view="document")
     def create_document_view(self):
         if not self.current_document:
-            return ft.Container(
+            self.document_reader = None
+            self.play_button = None
+            self.document_view = ft.Container(
                 content=ft.Column([
                     ft.Icon(ft.icons.DESCRIPTION, size=100, color=ft.colors.GREY_400),
                     ft.Text("No document loaded", size=20, color=ft.colors.GREY_600),
@@ -267,8 +438,26 @@ class SpeechEaseAppEnhanced:
                 alignment=ft.alignment.center,
                 expand=True,
             )
+            return self.document_view
+        
+        self.load_progress = ft.ProgressBar(value=0, expand=True)
+        self.load_row = ft.Row([
+            self.load_progress,
+            ft.IconButton(
+                icon=ft.icons.CLOSE,
+                tooltip="Cancel loading",
+                on_click=self.cancel_loading,
+            ),
+        ], visible=self.loader is not None)
         
-        # Document content area
+        # Document content area; only a window of the text is rendered
+        self.document_reader = DocumentReader(
+            self.current_document["text"],
+            font_size=self.settings["font_size"],
+            color=ft.colors.GREY_700 if not self.settings["dark_mode"] else ft.colors.GREY_300,
+            highlight_color=HIGHLIGHT_COLORS.get(self.settings["highlight_color"], ft.colors.YELLOW_200),
+            index=self.text_index,
+        )
         document_content = ft.Container(
             content=ft.Column([
                 ft.Text(
@@ -277,32 +466,56 @@ class SpeechEaseAppEnhanced:
                     weight=ft.FontWeight.BOLD,
                     color=ft.colors.GREY_800 if not self.settings["dark_mode"] else ft.colors.WHITE,
                 ),
+                self.load_row,
                 ft.Container(height=20),
-                ft.Text(
-                    self.current_document["text"],
-                    size=self.settings["font_size"],
-                    selectable=True,
-                    color=ft.colors.GREY_700 if not self.settings["dark_mode"] else ft.colors.GREY_300,
-                ),
-            ], scroll=ft.ScrollMode.AUTO),
+                self.document_reader.list_view,
+            ]),
             expand=True,
             bgcolor=ft.colors.WHITE if not self.settings["dark_mode"] else ft.colors.GREY_700,
             border_radius=10,
             padding=20,
         )
         
+        self.play_button = ft.IconButton(
+            icon=ft.icons.PAUSE if self.is_playing else ft.icons.PLAY_ARROW,
+            icon_size=32,
+            bgcolor=ft.colors.BLUE_500,
+            icon_color=ft.colors.WHITE,
+            on_click=self.toggle_playback,
+            tooltip="Play/Pause",
+        )
+        self.speed_slider = ft.Slider(
+            min=0.5,
+            max=2.0,
+            value=self.settings["speed"],
+            divisions=15,
+            label=f"{self.settings['speed']:.1f}x",
+            on_change=self.speed_changed,
+        )
+        self.volume_slider = ft.Slider(
+            min=0.0,
+            max=1.0,
+            value=self.settings["volume"],
+            divisions=10,
+            label=f"{int(self.settings['volume']*100)}%",
+            on_change=self.volume_changed,
+        )
+        
         # Control panel
         control_panel = ft.Container(
             content=ft.Column([
                 # Playback controls
                 ft.Row([
                     ft.IconButton(
-                        icon=ft.icons.PAUSE if self.is_playing else ft.icons.PLAY_ARROW,
-                        icon_size=32,
-                        bgcolor=ft.colors.BLUE_500,
-                        icon_color=ft.colors.WHITE,
-                        on_click=self.toggle_playback,
-                        tooltip="Play/Pause",
+                        icon=ft.icons.SKIP_PREVIOUS,
+                        on_click=lambda e: self.skip_sentences(-1),
+                        tooltip="Previous sentence",
+                    ),
+                    self.play_button,
+                    ft.IconButton(
+                        icon=ft.icons.SKIP_NEXT,
+                        on_click=lambda e: self.skip_sentences(1),
+                        tooltip="Next sentence",
                     ),
                     ft.IconButton(
                         icon=ft.icons.STOP,
@@ -318,27 +531,13 @@ class SpeechEaseAppEnhanced:
                 
                 # Speed control
                 ft.Text("Speed", weight=ft.FontWeight.W_500),
-                ft.Slider(
-                    min=0.5,
-                    max=2.0,
-                    value=self.settings["speed"],
-                    divisions=15,
-                    label=f"{self.settings['speed']:.1f}x",
-                    on_change=self.speed_changed,
-                ),
+                self.speed_slider,
                 
                 ft.Container(height=10),
                 
                 # Volume control
                 ft.Text("Volume", weight=ft.FontWeight.W_500),
-                ft.Slider(
-                    min=0.0,
-                    max=1.0,
-                    value=self.settings["volume"],
-                    divisions=10,
-                    label=f"{int(self.settings['volume']*100)}%",
-                    on_change=self.volume_changed,
-                ),
+                self.volume_slider,
                 
                 ft.Container(height=20),
                 
@@ -372,12 +571,14 @@ class SpeechEaseAppEnhanced:
             padding=20,
         )
         
-        return ft.Row([
+        self.document_view = ft.Row([
             document_content,
             ft.Container(width=20),
             control_panel,
         ], expand=True)
+        return self.document_view
     
+    @metrics.timed_method("speechease_view_build_seconds", view="settings")
     def create_settings_view(self):
         return ft.Column([
             ft.Text(
@@ -470,17 +671,13 @@ class SpeechEaseAppEnhanced:
         def paste_and_close(e):
             text = text_field.value.strip()
             if text:
+                # Add to the library (deduplicated by content) and search index
+                doc, self.text_index = self.library.add_document("Pasted Text", None, text)
+                search_index = DocumentProcessor.get_search_index()
+                if search_index is not None:
+                    search_index.add_document("Pasted Text", None, text, index=self.text_index)
                 self.current_text = text
-                self.current_document = {
-                    "name": "Pasted Text",
-                    "path": None,
-                    "text": text,
-                    "date": datetime.now().strftime("%Y-%m-%d")
-                }
-                # Add to recent documents
-                self.recent_documents.insert(0, self.current_document)
-                if len(self.recent_documents) > 10:
-                    self.recent_documents = self.recent_documents[:10]
+                self.current_document = dict(doc, text=text)
                 
                 # Switch to document view
                 self.nav_rail.selected_index = 1
@@ -516,63 +713,303 @@ class SpeechEaseAppEnhanced:
         dialog.open = True
         self.page.update()
     
+    @metrics.timed_method("speechease_handler_seconds", handler="search_documents")
+    def search_documents(self, e):
+        search_index = DocumentProcessor.get_search_index()
+        hits = search_index.search(e.control.value) if search_index else []
+        if hits:
+            self.search_results.controls = [
+                ft.ListTile(
+                    leading=ft.Icon(ft.icons.DESCRIPTION, color=ft.colors.BLUE_500),
+                    title=ft.Text(f"{hit['name']} (page {hit['page']})"),
+                    subtitle=ft.Text(hit["snippet"], max_lines=2),
+                    on_click=lambda e, hit=hit: self.open_search_hit(hit),
+                )
+                for hit in hits
+            ]
+        else:
+            self.search_results.controls = [
+                ft.Text("No matches found", color=ft.colors.GREY_600),
+            ]
+        self.search_results.update()
+    
+    def open_search_hit(self, hit):
+        """Open the document containing a search hit, positioned at the match"""
+        doc = self.library.find_by_hash(hit["content_hash"])
+        text = self.library.load_text(doc["id"]) if doc else None
+        index = None
+        if text is None and hit["path"]:
+            result = DocumentProcessor.extract_document(hit["path"])
+            if result and result[0]:
+                text = result[0]
+                doc, index = self.library.add_document(
+                    os.path.basename(hit["path"]), hit["path"], text, result[1])
+        if text is None:
+            self.show_snackbar("Document is no longer available")
+            return
+        self.current_document = dict(doc, text=text, page_kinds=self.load_page_kinds(doc))
+        self.current_text = text
+        self.text_index = index or self.library.load_index(doc["id"], text)
+        # Playback starts from the sentence containing the match
+        offset = hit["offset"]
+        if self.text_index is not None:
+            offset = self.text_index.sentence_start(offset)
+        self.save_reading_position(offset)
+        self.nav_rail.selected_index = 1
+        self.current_view = "document"
+        self.content_area.content = self.create_document_view()
+        self.page.update()
+        self.document_reader.scroll_to_offset(hit["offset"])
+    
+    @metrics.timed_method("speechease_handler_seconds", handler="open_document")
     def open_document(self, doc):
-        self.current_document = doc
-        self.current_text = doc["text"]
+        # Only metadata is kept for the home grid; text is loaded on open
+        text = self.library.load_text(doc["id"])
+        if text is None:
+            self.show_snackbar("Document is no longer in the library")
+            return
+        self.current_document = dict(doc, text=text, page_kinds=self.load_page_kinds(doc))
+        self.current_text = text
+        self.text_index = self.library.load_index(doc["id"], text)
         self.nav_rail.selected_index = 1
         self.current_view = "document"
         self.content_area.content = self.create_document_view()
         self.page.update()
     
+    @metrics.timed_method("speechease_handler_seconds", handler="toggle_playback")
     def toggle_playback(self, e):
         if not self.current_document:
             self.show_snackbar("No document loaded")
             return
         
         if self.is_playing:
-            self.tts_engine.stop()
+            self.tts_engine.pause()
             self.is_playing = False
+            self.save_reading_position(self.tts_engine.current_position)
+        elif self.tts_engine.is_paused and self.tts_engine.current_text == self.current_document["text"]:
+            self.tts_engine.resume()
+            self.is_playing = True
         else:
-            self.tts_engine.speak(self.current_document["text"])
+            self.speak_from(self.current_document.get("position", 0))
             self.is_playing = True
         
-        # Update the button icon
-        if self.current_view == "document":
-            self.content_area.content = self.create_document_view()
-            self.page.update()
+        self.update_play_button()
         
         status = "Playing..." if self.is_playing else "Paused"
         self.show_snackbar(status)
     
+    @metrics.timed_method("speechease_handler_seconds", handler="stop_playback")
     def stop_playback(self, e):
         self.tts_engine.stop()
         self.is_playing = False
-        
-        # Update the view
-        if self.current_view == "document":
-            self.content_area.content = self.create_document_view()
-            self.page.update()
+        self.save_reading_position(0)
+        self.update_play_button()
+        self.highlight_throttle.cancel()
+        if self.document_reader is not None:
+            self.document_reader.clear_highlight()
         
         self.show_snackbar("Stopped")
     
+    @metrics.timed_method("speechease_handler_seconds", handler="skip_sentences")
+    def skip_sentences(self, count):
+        """Move playback, or the resume position, by whole sentences"""
+        if not self.current_document or self.text_index is None:
+            return
+        # Whether the engine holds this document, playing or paused
+        active = (self.tts_engine.state != IDLE
+                  and self.tts_engine.current_text == self.current_document["text"])
+        if active:
+            position = self.tts_engine.current_position
+        else:
+            position = self.current_document.get("position", 0)
+        position = self.text_index.skip_sentences(position, count)
+        self.save_reading_position(position)
+        if self.is_playing:
+            self.speak_from(position)
+        else:
+            if active:
+                # Play picks up from the new position instead of resuming
+                self.tts_engine.stop()
+            if self.document_reader is not None:
+                self.document_reader.scroll_to_offset(position)
+    
+    def speak_from(self, position):
+        """Start speaking the current document at a character offset"""
+        # Pages without text before the first one read are announced only
+        # when reading from the very start
+        if position > 0 and self.text_index is not None:
+            self.spoken_page = self.text_index.page_at(position)
+        else:
+            self.spoken_page = 0
+        self.tts_engine.speak(
+            self.current_document["text"],
+            on_word=self.on_word,
+            start_position=position,
+            index=self.text_index,
+        )
+    
+    def save_reading_position(self, position):
+        """Remember where reading stopped so the document resumes there"""
+        if self.current_document and self.current_document.get("id") is not None:
+            self.current_document["position"] = position
+            self.library.set_position(self.current_document["id"], position)
+    
+    def on_word(self, offset, length):
+        """Called from the TTS thread for every spoken word"""
+        self.highlight_throttle.submit((offset, length))
+    
+    def apply_highlight(self, span):
+        offset, length = span
+        if self.document_reader is None or self.current_view != "document":
+            return
+        moved = self.document_reader.highlight(offset, length)
+        if moved and self.settings["auto_scroll"]:
+            self.document_reader.scroll_to_offset(offset)
+        self.announce_skipped_pages(offset)
+    
+    def announce_skipped_pages(self, offset):
+        """Tell the listener when reading moves past pages that have no text"""
+        kinds = self.current_document.get("page_kinds") if self.current_document else None
+        if not kinds or self.text_index is None or self.spoken_page is None:
+            return
+        page = self.text_index.page_at(offset)
+        previous, self.spoken_page = self.spoken_page, page
+        skipped = pages_without_text(kinds, previous + 1, page)
+        if len(skipped) == 1:
+            self.show_snackbar(f"Page {skipped[0]} has no text and was skipped")
+        elif skipped:
+            pages = ", ".join(str(number) for number in skipped)
+            self.show_snackbar(f"Pages {pages} have no text and were skipped")
+    
+    def load_page_kinds(self, doc):
+        """Kind of each page of a library document's PDF, or [] if unavailable"""
+        path = doc.get("path")
+        if not path or not os.path.exists(path):
+            return []
+        return DocumentProcessor.page_map(path)
+    
+    def on_tts_state_change(self, state):
+        """Called from the TTS engine thread whenever playback state changes"""
+        self.is_playing = state == SPEAKING
+        if self.page is not None:
+            self.update_play_button()
+    
+    def update_play_button(self):
+        """Flip the Play/Pause icon without rebuilding the document view"""
+        if self.play_button is None:
+            return
+        self.play_button.icon = ft.icons.PAUSE if self.is_playing else ft.icons.PLAY_ARROW
+        if self.play_button.page is not None:
+            self.play_button.update()
+    
     def speed_changed(self, e):
         self.settings["speed"] = e.control.value
         self.tts_engine.set_rate(self.settings["speed"])
         self.save_settings()
+        self.speed_slider.label = f"{self.settings['speed']:.1f}x"
+        self.speed_slider.update()
     
     def volume_changed(self, e):
         self.settings["volume"] = e.control.value
         self.tts_engine.set_volume(self.settings["volume"])
         self.save_settings()
+        self.volume_slider.label = f"{int(self.settings['volume']*100)}%"
+        self.volume_slider.update()
     
     def voice_changed(self, e):
         self.settings["voice"] = e.control.value
         self.tts_engine.set_voice(self.settings["voice"])
         self.save_settings()
     
+    @metrics.timed_method("speechease_handler_seconds", handler="export_audio")
     def export_audio(self, e):
-        self.show_snackbar("Audio export feature coming soon!")
+        if not self.current_document:
+            self.show_snackbar("No document loaded")
+            return
+        if self.loader is not None:
+            self.show_snackbar("Wait for the document to finish loading")
+            return
+        
+        name = os.path.splitext(self.current_document["name"])[0]
+        if self.page.web:
+            # The file is written on the server; put it where Flet's web
+            # server serves assets (under an unguessable directory) and
+            # hand the browser its URL
+            token = uuid.uuid4().hex
+            export_dir = os.path.join(EXPORTS_DIR, token)
+            output_path = os.path.join(export_dir, f"{name}.wav")
+            download_url = f"/exports/{token}/{urllib.parse.quote(name)}.wav"
+        else:
+            export_dir = None
+            output_path = os.path.join("exports", f"{name}.wav")
+            download_url = None
+        text = self.current_document["text"]
+        progress_bar = ft.ProgressBar(value=0, width=400)
+        status_text = ft.Text("Rendering audio...")
+        dialog = ft.AlertDialog(
+            title=ft.Text("Exporting Audio"),
+            content=ft.Column([status_text, progress_bar], tight=True),
+            modal=True,
+        )
+        self.page.dialog = dialog
+        dialog.open = True
+        self.page.update()
+        
+        def on_progress(done, total):
+            progress_bar.value = done / total
+            status_text.value = f"Rendered {done} of {total} chunks"
+            self.page.update()
+        
+        def export_thread():
+            exporter = AudioExporter(
+                voice=self.settings["voice"],
+                rate=self.settings["speed"],
+                volume=self.settings["volume"],
+            )
+            try:
+                if export_dir:
+                    with self.exports_lock:
+                        self.exports[export_dir] = None
+                exporter.export(text, output_path, progress=on_progress)
+                if download_url:
+                    self.expire_export(export_dir)
+                    self.page.launch_url(download_url)
+                    message = f"Exported: {name}.wav"
+                else:
+                    message = f"Exported: {output_path}"
+            except Exception as ex:
+                print(f"Error exporting audio: {ex}")
+                message = "Audio export failed"
+                if export_dir:
+                    self.remove_export(export_dir)
+            dialog.open = False
+            self.show_snackbar(message)
+        
+        thread = threading.Thread(target=export_thread)
+        thread.daemon = True
+        thread.start()
     
+    def expire_export(self, export_dir: str):
+        """Delete a finished web export once it has had EXPORT_TTL to download"""
+        timer = threading.Timer(EXPORT_TTL, self.remove_export, args=(export_dir,))
+        timer.daemon = True
+        with self.exports_lock:
+            tracked = export_dir in self.exports
+            if tracked:
+                self.exports[export_dir] = timer
+        if tracked:
+            timer.start()
+        else:
+            # The session closed while the export was rendering
+            shutil.rmtree(export_dir, ignore_errors=True)
+
+    def remove_export(self, export_dir: str):
+        with self.exports_lock:
+            timer = self.exports.pop(export_dir, None)
+        if timer is not None:
+            timer.cancel()
+        shutil.rmtree(export_dir, ignore_errors=True)
+
     def toggle_dark_mode(self, e):
         self.settings["dark_mode"] = e.control.value
         self.page.theme_mode = ft.ThemeMode.DARK if self.settings["dark_mode"] else ft.ThemeMode.LIGHT
@@ -586,9 +1023,10 @@ class SpeechEaseAppEnhanced:
     def font_size_changed(self, e):
         self.settings["font_size"] = int(e.control.value)
         self.save_settings()
-        if self.current_view == "document":
-            self.content_area.content = self.create_document_view()
-            self.page.update()
+        if self.document_reader is not None:
+            self.document_reader.set_font_size(self.settings["font_size"])
+        e.control.label = f"{self.settings['font_size']}px"
+        e.control.update()
     
     def toggle_high_contrast(self, e):
         self.settings["high_contrast"] = e.control.value
@@ -597,6 +1035,9 @@ class SpeechEaseAppEnhanced:
     def highlight_color_changed(self, e):
         self.settings["highlight_color"] = e.control.value
         self.save_settings()
+        if self.document_reader is not None:
+            self.document_reader.highlight_color = HIGHLIGHT_COLORS.get(
+                self.settings["highlight_color"], ft.colors.YELLOW_200)
     
     def refresh_current_view(self):
         if self.current_view == "home":
@@ -622,25 +1063,31 @@ class SpeechEaseAppEnhanced:
         self.page.snack_bar.open = True
         self.page.update()
     
+    def on_session_closed(self, e):
+        # Give this session's place in the TTS pool back
+        self.settings_store.flush()
+        self.tts_engine.shutdown()
+        metrics.remove_session(self.page.session_id)
+        with self.exports_lock:
+            export_dirs = list(self.exports)
+        for export_dir in export_dirs:
+            self.remove_export(export_dir)
+
     def load_settings(self):
-        try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    saved_settings = json.load(f)
-                    self.settings.update(saved_settings)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
+        self.settings.update(self.settings_store.load())
     
     def save_settings(self):
-        try:
-            with open("settings.json", "w") as f:
-                json.dump(self.settings, f, indent=2)
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        # Debounced: the actual write happens on the store's background thread
+        self.settings_store.save(self.settings)
 
 def main(page: ft.Page):
     app = SpeechEaseAppEnhanced()
     app.main(page)
 
 if __name__ == "__main__":
-    ft.app(target=main ,view=ft.WEB_BROWSER)
+    metrics.configure_from_env()
+    # Flet only serves an assets directory that exists at startup. Exports
+    # left by a previous run belong to sessions that no longer exist.
+    shutil.rmtree(EXPORTS_DIR, ignore_errors=True)
+    os.makedirs(EXPORTS_DIR, exist_ok=True)
+    ft.app(target=main ,view=ft.WEB_BROWSER, assets_dir=ASSETS_DIR)
@@ -0,0 +1,342 @@
+"""Lightweight timers, counters, gauges and histograms with Prometheus and JSON export.
+
+Instrumentation is disabled by default and then costs one flag check per
+instrumented call. Enable it with enable() or the SPEECHEASE_METRICS=1
+environment variable (see configure_from_env()). Series are identified by
+a metric name plus labels; web sessions add a `session` label, so each
+session gets its own histograms, and remove_session() drops them when the
+session ends.
+"""
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds, suited to UI and I/O latencies
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25,
+                   0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_enabled = False
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, Tuple], float] = {}
+_gauges: Dict[Tuple[str, Tuple], float] = {}
+_histograms: Dict[Tuple[str, Tuple], "Histogram"] = {}
+# HELP text for the metrics the app records; describe() adds more
+_help: Dict[str, str] = {
+    "speechease_extraction_seconds": "Time to extract a document, by format and source",
+    "speechease_document_load_seconds": "Time to load a document in the background",
+    "speechease_tts_commands_total": "Playback commands issued",
+    "speechease_tts_startup_seconds": "Time to initialize a speech driver",
+    "speechease_tts_first_audio_seconds": "Time from speak or resume to the first audio",
+    "speechease_tts_chunk_gap_seconds": "Silence between consecutive chunks",
+    "speechease_view_build_seconds": "Time to build a view's control tree",
+    "speechease_handler_seconds": "Time spent in UI event handlers",
+    "speechease_page_update_seconds": "page.update() round-trip time",
+    "speechease_tts_pool_workers": "Speech worker processes in the TTS pool",
+    "speechease_tts_pool_sessions": "Sessions with jobs queued or running in the TTS pool",
+    "speechease_tts_pool_queue_depth": "Jobs waiting for a TTS pool worker",
+    "speechease_tts_pool_running": "Jobs running on TTS pool workers",
+    "speechease_tts_pool_session_queue_depth": "Jobs a session has waiting for a TTS pool worker",
+    "speechease_tts_pool_jobs_submitted_total": "Jobs submitted to the TTS pool",
+    "speechease_tts_pool_jobs_completed_total": "Jobs finished by TTS pool workers",
+}
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((repr(bound), total))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def describe(name: str, text: str):
+    """Set the HELP text exported for a metric"""
+    _help[name] = text
+
+
+def _key(name: str, labels: dict) -> Tuple[str, Tuple]:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def increment(name: str, amount: float = 1, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def set_gauge(name: str, value: float, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _gauges[key] = value
+
+
+def remove_gauge(name: str, **labels):
+    """Drop a gauge series, e.g. for a queue that no longer exists"""
+    key = _key(name, labels)
+    with _lock:
+        _gauges.pop(key, None)
+
+
+def observe(name: str, value: float, **labels):
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name: str, **labels):
+    """Context manager observing the duration of its block, in seconds"""
+    return _Timer(name, labels) if _enabled else _NULL_TIMER
+
+
+def timed(name: str, **labels) -> Callable:
+    """Decorator observing each call's duration"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start, **labels)
+        return wrapper
+    return decorator
+
+
+def timed_method(name: str, **labels) -> Callable:
+    """Like timed(), adding the instance's `metrics_labels` (e.g. its session)"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return func(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start,
+                        **labels, **getattr(self, "metrics_labels", {}))
+        return wrapper
+    return decorator
+
+
+def remove_session(session: str):
+    """Forget every series labelled with this session"""
+    label = ("session", str(session))
+    with _lock:
+        for series in (_counters, _gauges, _histograms):
+            for key in [key for key in series if label in key[1]]:
+                del series[key]
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Tuple, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = list(labels) + ([extra] if extra else [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def render_prometheus() -> str:
+    """All series in the Prometheus text exposition format"""
+    with _lock:
+        counters = sorted(_counters.items())
+        gauges = sorted(_gauges.items())
+        histograms = sorted((key, histogram.cumulative(), histogram.sum, histogram.count)
+                            for key, histogram in _histograms.items())
+    lines = []
+    seen = set()
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), value in gauges:
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+    for (name, labels), buckets, total, count in histograms:
+        if name not in seen:
+            seen.add(name)
+            if name in _help:
+                lines.append(f"# HELP {name} {_help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+        for bound, cumulative in buckets:
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', bound))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot() -> dict:
+    """All series as plain data, for JSON export"""
+    with _lock:
+        return {
+            "timestamp": time.time(),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(_counters.items())
+            ],
+            "gauges": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(_gauges.items())
+            ],
+            "histograms": [
+                {"name": name, "labels": dict(labels), "count": h.count, "sum": h.sum,
+                 "buckets": dict(h.cumulative())}
+                for (name, labels), h in sorted(_histograms.items(), key=lambda item: item[0])
+            ],
+        }
+
+
+def start_json_snapshots(path: str, interval: float = 60.0) -> threading.Thread:
+    """Write snapshot() to `path` every `interval` seconds on a daemon thread"""
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                temp_path = path + ".tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot(), f)
+                os.replace(temp_path, path)
+            except Exception as e:
+                print(f"Error writing metrics: {e}")
+
+    thread = threading.Thread(target=run, name="metrics-json")
+    thread.daemon = True
+    thread.start()
+    return thread
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve render_prometheus() at http://host:port/metrics on a daemon thread"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http")
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def configure_from_env():
+    """Set up metrics from the environment:
+
+    SPEECHEASE_METRICS=1             enable instrumentation
+    SPEECHEASE_METRICS_PORT=9464     serve Prometheus text at /metrics
+    SPEECHEASE_METRICS_JSON=path     write JSON snapshots to path
+    SPEECHEASE_METRICS_INTERVAL=60   seconds between JSON snapshots
+    """
+    if os.environ.get("SPEECHEASE_METRICS", "") not in ("1", "true", "yes"):
+        return
+    enable()
+    try:
+        port = os.environ.get("SPEECHEASE_METRICS_PORT")
+        if port:
+            start_http_server(int(port))
+        json_path = os.environ.get("SPEECHEASE_METRICS_JSON")
+        if json_path:
+            start_json_snapshots(json_path, float(os.environ.get("SPEECHEASE_METRICS_INTERVAL", 60)))
+    except Exception as e:
+        print(f"Error starting metrics export: {e}")
@@ -0,0 +1,102 @@
+import re
+from typing import List, Optional, Tuple
+
+# Page kinds
+TEXT = "text"
+IMAGE_ONLY = "image"
+MIXED = "mixed"
+EMPTY = "empty"
+
+# Kinds whose text is worth extracting
+HAS_TEXT = (TEXT, MIXED)
+
+# Content stream operators, as whole tokens
+_BEGIN_TEXT = re.compile(rb"(?:^|[\s\])>])BT(?=[\s/\[(<]|$)")
+_INLINE_IMAGE = re.compile(rb"(?:^|\s)BI(?=\s)")
+_DRAW_XOBJECT = re.compile(rb"/([^\s/\[\]()<>{}%]+)\s*Do(?=[\s/\[(<]|$)")
+# Form XObjects can nest; deeper ones are assumed to hold text
+_MAX_FORM_DEPTH = 4
+
+
+def _resolve(obj):
+    return obj.get_object() if obj is not None and hasattr(obj, "get_object") else obj
+
+
+def _scan(data: bytes, resources, depth: int) -> Tuple[bool, bool]:
+    """Return (draws text, draws images) for a content stream"""
+    has_text = bool(_BEGIN_TEXT.search(data))
+    has_image = bool(_INLINE_IMAGE.search(data))
+    if has_text and has_image:
+        return True, True
+    resources = _resolve(resources) or {}
+    xobjects = _resolve(resources.get("/XObject")) or {}
+    for name in set(_DRAW_XOBJECT.findall(data)):
+        xobject = _resolve(xobjects.get("/" + name.decode("latin-1")))
+        if xobject is None:
+            continue
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            has_image = True
+        elif subtype == "/Form":
+            if depth >= _MAX_FORM_DEPTH:
+                has_text = True
+            else:
+                form_text, form_image = _scan(
+                    xobject.get_data(), xobject.get("/Resources") or resources, depth + 1)
+                has_text = has_text or form_text
+                has_image = has_image or form_image
+        if has_text and has_image:
+            break
+    return has_text, has_image
+
+
+def _content_bytes(page) -> bytes:
+    # The raw stream data; page.get_contents() would parse it into operations
+    contents = _resolve(page.get("/Contents"))
+    if contents is None:
+        return b""
+    if isinstance(contents, list):
+        return b"\n".join(_resolve(part).get_data() for part in contents)
+    return contents.get_data()
+
+
+def classify_page(page) -> str:
+    """Label a PyPDF2 page as text, image-only, mixed or empty
+
+    Only the page's content streams and resources are inspected, which is
+    far cheaper than extract_text(). Pages that cannot be inspected are
+    labelled text so they still go through full extraction.
+    """
+    try:
+        has_text, has_image = _scan(_content_bytes(page), page.get("/Resources"), 0)
+    except Exception:
+        return TEXT
+    if has_text:
+        return MIXED if has_image else TEXT
+    return IMAGE_ONLY if has_image else EMPTY
+
+
+def classify_pdf(file_path: str) -> List[str]:
+    """Return the kind of every page of a PDF, in page order"""
+    import PyPDF2
+    with open(file_path, 'rb') as file:
+        return [classify_page(page) for page in PyPDF2.PdfReader(file).pages]
+
+
+def extract_page(page, kinds: Optional[List[str]] = None) -> str:
+    """Return a page's text, skipping extraction for pages without a text layer
+
+    The page's kind is appended to `kinds` when given.
+    """
+    kind = classify_page(page)
+    if kinds is not None:
+        kinds.append(kind)
+    if kind not in HAS_TEXT:
+        return ""
+    return page.extract_text() or ""
+
+
+def pages_without_text(kinds: List[str], first: int, stop: int) -> List[int]:
+    """1-based numbers of the pages in [first, stop) that have no text layer"""
+    return [page for page in range(max(first, 1), min(stop, len(kinds) + 1))
+            if kinds[page - 1] not in HAS_TEXT]
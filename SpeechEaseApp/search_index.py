@@ -0,0 +1,173 @@
+import bisect
+import contextlib
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from typing import List, Optional
+
+from text_chunker import split_into_chunks
+from text_index import TextIndex
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".speechease", "search_index.db")
+
+# Markers wrapped around the first match so its exact offset can be recovered
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+
+
+def text_hash(text: str) -> str:
+    """Content key shared with DocumentLibrary"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _pack_offsets(offsets: List[int]) -> bytes:
+    values = array('q', offsets)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _unpack_offsets(data: bytes) -> array:
+    values = array('q')
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class SearchIndex:
+    """Full-text index over every extracted document, using SQLite FTS5.
+
+    Each document is split into paragraph passages that are indexed along
+    with their start offset, and its page start offsets are stored beside
+    them, so a hit maps straight back to a position and page in the text
+    without rescanning it. Documents are keyed by the hash of their text and
+    indexed once; adding a known document is a single lookup.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_INDEX_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_documents ("
+                " content_hash TEXT PRIMARY KEY, name TEXT NOT NULL, path TEXT,"
+                " indexed REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5("
+                " text, content_hash UNINDEXED, start UNINDEXED, page UNINDEXED,"
+                " tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS document_pages ("
+                " content_hash TEXT PRIMARY KEY, offsets BLOB NOT NULL)"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def has_document(self, content_hash: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT 1 FROM indexed_documents WHERE content_hash = ?", (content_hash,)
+            ).fetchone() is not None
+
+    def add_document(self, name: str, path: Optional[str], text: str,
+                     page_offsets: Optional[List[int]] = None,
+                     content_hash: Optional[str] = None,
+                     index: Optional[TextIndex] = None) -> str:
+        """Index a document unless it is already indexed; returns its content hash
+
+        Passages are the paragraphs of the text's TextIndex when one is given.
+        """
+        content_hash = content_hash or text_hash(text)
+        with self._connect() as conn:
+            if conn.execute(
+                "SELECT 1 FROM indexed_documents WHERE content_hash = ?", (content_hash,)
+            ).fetchone():
+                return content_hash
+            page_offsets = page_offsets or [0]
+            if index is not None and index.length == len(text):
+                passages = index.paragraphs
+                page_offsets = index.pages
+            else:
+                passages = split_into_chunks(text, "paragraph")
+            conn.executemany(
+                "INSERT INTO passages (text, content_hash, start, page) VALUES (?, ?, ?, ?)",
+                (
+                    (text[start:end], content_hash, start,
+                     bisect.bisect_right(page_offsets, start))
+                    for start, end in passages
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO document_pages (content_hash, offsets) VALUES (?, ?)",
+                (content_hash, _pack_offsets(page_offsets)),
+            )
+            conn.execute(
+                "INSERT INTO indexed_documents (content_hash, name, path, indexed)"
+                " VALUES (?, ?, ?, ?)",
+                (content_hash, name, path, time.time()),
+            )
+        return content_hash
+
+    def remove_document(self, content_hash: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM passages WHERE content_hash = ?", (content_hash,))
+            conn.execute("DELETE FROM document_pages WHERE content_hash = ?", (content_hash,))
+            conn.execute("DELETE FROM indexed_documents WHERE content_hash = ?", (content_hash,))
+
+    @staticmethod
+    def _to_match_query(query: str) -> str:
+        # Quote every term so user input can never be parsed as FTS5 syntax;
+        # terms are implicitly ANDed
+        return " ".join('"%s"' % term.replace('"', '""') for term in query.split())
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """Return the best matching passages with document, page and character offset
+
+        The page is that of the first match, looked up in the document's
+        page offsets; documents indexed without them report the page the
+        passage starts on.
+        """
+        match = self._to_match_query(query)
+        if not match:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p.content_hash, d.name, d.path, p.start, p.page,"
+                " highlight(passages, 0, ?, ?),"
+                " snippet(passages, 0, '', '', '...', 16), g.offsets"
+                " FROM passages p JOIN indexed_documents d USING (content_hash)"
+                " LEFT JOIN document_pages g USING (content_hash)"
+                " WHERE passages MATCH ? ORDER BY rank LIMIT ?",
+                (_MATCH_START, _MATCH_END, match, limit),
+            ).fetchall()
+        hits = []
+        pages = {}
+        for content_hash, name, path, start, page, highlighted, snippet, offsets in rows:
+            offset = start + max(0, highlighted.find(_MATCH_START))
+            if offsets is not None:
+                if content_hash not in pages:
+                    pages[content_hash] = _unpack_offsets(offsets)
+                page = max(1, bisect.bisect_right(pages[content_hash], offset))
+            hits.append({
+                "content_hash": content_hash,
+                "name": name,
+                "path": path,
+                "offset": offset,
+                "page": page,
+                "snippet": snippet,
+            })
+        return hits
@@ -0,0 +1,126 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+
+class SettingsStore:
+    """Debounced, atomic persistence for the settings dictionary.
+
+    save() only takes a snapshot and returns; a background thread writes it
+    once no further changes have arrived for `delay` seconds, so dragging a
+    slider costs one write instead of dozens. Writes go to a temporary file
+    in the same directory that is then renamed over the original, so a crash
+    never leaves a truncated settings file. Pending changes are flushed on
+    close() and at interpreter exit.
+    """
+
+    def __init__(self, path: str = "settings.json", delay: float = 0.5):
+        self.path = path
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._pending: Optional[dict] = None
+        self._version = 0
+        self._last_change = 0.0
+        # Serializes writes so an older snapshot never replaces a newer one
+        self._write_lock = threading.Lock()
+        self._written_version = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="settings-writer")
+        self._thread.daemon = True
+        self._thread.start()
+        atexit.register(self.close)
+
+    def load(self) -> dict:
+        """Return the saved settings, or an empty dict if there are none"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading settings: {e}")
+        return {}
+
+    def save(self, settings: dict):
+        """Schedule settings to be written; never blocks on disk I/O"""
+        with self._cond:
+            self._pending = dict(settings)
+            self._version += 1
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+    def flush(self):
+        """Write any pending settings immediately"""
+        with self._cond:
+            settings, self._pending = self._pending, None
+            version = self._version
+        if settings is not None:
+            self._write(settings, version)
+
+    def close(self):
+        """Flush pending settings and stop the writer thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # Wait until changes have stopped arriving for `delay` seconds
+                while not self._closed:
+                    remaining = self._last_change + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                settings, self._pending = self._pending, None
+                version = self._version
+            if settings is not None:
+                self._write(settings, version)
+
+    def _write(self, settings: dict, version: int):
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            self._written_version = version
+            self._write_file(settings)
+
+    def _write_file(self, settings: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(settings, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.remove(temp_path)
+                raise
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_settings_store(path: str = "settings.json") -> SettingsStore:
+    """Return the process-wide store for path, so sessions share one writer"""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = SettingsStore(path)
+        return _stores[key]
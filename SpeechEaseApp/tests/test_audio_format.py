@@ -0,0 +1,53 @@
+import warnings
+import wave
+
+import pytest
+
+from audio_exporter import stitch_wav_files
+from audio_format import ensure_wav
+
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore", DeprecationWarning)
+    aifc = pytest.importorskip("aifc")
+
+
+def write_aiff(path, frames, channels=1, width=2, rate=22050):
+    with aifc.open(str(path), "wb") as output:
+        output.setnchannels(channels)
+        output.setsampwidth(width)
+        output.setframerate(rate)
+        output.writeframes(frames)
+
+
+def test_aiff_is_converted_to_wav(tmp_path):
+    samples = [0, 1, -1, 1000, -32768, 32767]
+    big_endian = b"".join(sample.to_bytes(2, "big", signed=True) for sample in samples)
+    path = tmp_path / "chunk.wav"
+    write_aiff(path, big_endian)
+    ensure_wav(str(path))
+    with wave.open(str(path)) as converted:
+        assert converted.getparams()[:4] == (1, 2, 22050, len(samples))
+        little_endian = b"".join(sample.to_bytes(2, "little", signed=True) for sample in samples)
+        assert converted.readframes(len(samples)) == little_endian
+
+
+def test_stitch_accepts_mixed_aiff_and_wav(tmp_path):
+    first = tmp_path / "0.wav"
+    write_aiff(first, b"\x00\x01" * 4)
+    second = tmp_path / "1.wav"
+    with wave.open(str(second), "wb") as output:
+        output.setnchannels(1)
+        output.setsampwidth(2)
+        output.setframerate(22050)
+        output.writeframes(b"\x02\x00" * 4)
+    stitched = tmp_path / "out.wav"
+    stitch_wav_files([str(first), str(second)], str(stitched))
+    with wave.open(str(stitched)) as output:
+        assert output.readframes(8) == b"\x01\x00" * 4 + b"\x02\x00" * 4
+
+
+def test_unknown_formats_are_reported(tmp_path):
+    path = tmp_path / "chunk.wav"
+    path.write_bytes(b"ID3\x00not audio")
+    with pytest.raises(ValueError, match="Unsupported audio format"):
+        ensure_wav(str(path))
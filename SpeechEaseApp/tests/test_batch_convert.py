@@ -0,0 +1,41 @@
+import os
+
+import batch_convert
+
+
+def test_failed_stitch_leaves_no_partial_output(tmp_path, monkeypatch):
+    source = tmp_path / "notes.txt"
+    source.write_text("One sentence. Another one.", encoding="utf-8")
+    output = tmp_path / "out" / "notes.wav"
+
+    def render(index, texts, file_paths, use_cache):
+        return index
+
+    def stitch(paths, output_path):
+        with open(output_path, "wb") as f:
+            f.write(b"RIFF")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(batch_convert.DocumentProcessor, "cache", False)
+    monkeypatch.setattr(batch_convert, "render_chunks", render)
+    monkeypatch.setattr(batch_convert, "stitch_wav_files", stitch)
+    entry = batch_convert.convert_document(str(source), str(output), use_cache=False)
+
+    assert entry["status"] == "failed"
+    assert "disk full" in entry["error"]
+    assert os.listdir(output.parent) == []
+
+
+def test_plan_outputs_keeps_extensions_only_on_collisions():
+    documents = [
+        os.path.join("reports", "q1.pdf"),
+        os.path.join("reports", "Q1.txt"),
+        os.path.join("reports", "q2.docx"),
+        os.path.join("archive", "q1.pdf"),
+    ]
+    assert batch_convert.plan_outputs(documents) == {
+        os.path.join("reports", "q1.pdf"): os.path.join("reports", "q1.pdf.wav"),
+        os.path.join("reports", "Q1.txt"): os.path.join("reports", "Q1.txt.wav"),
+        os.path.join("reports", "q2.docx"): os.path.join("reports", "q2.wav"),
+        os.path.join("archive", "q1.pdf"): os.path.join("archive", "q1.wav"),
+    }
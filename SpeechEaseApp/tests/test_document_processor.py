@@ -0,0 +1,41 @@
+import pytest
+
+PyPDF2 = pytest.importorskip("PyPDF2")
+
+from document_processor import DocumentProcessor
+from extraction_cache import ExtractionCache
+from pdf_classifier import EMPTY, IMAGE_ONLY, TEXT, pages_without_text
+
+
+@pytest.fixture
+def blank_pdf(tmp_path):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(3):
+        writer.add_blank_page(width=200, height=200)
+    path = tmp_path / "blank.pdf"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    monkeypatch.setattr(DocumentProcessor, "cache", cache)
+    return cache
+
+
+def test_page_map_is_not_cached_without_use_cache(blank_pdf, cache):
+    DocumentProcessor.extract_document(blank_pdf, use_cache=False, index=False)
+    assert cache.load_page_kinds(cache.file_key(blank_pdf)) is None
+
+    DocumentProcessor.extract_document(blank_pdf, index=False)
+    assert cache.load_page_kinds(cache.file_key(blank_pdf)) == [EMPTY] * 3
+
+
+def test_pages_without_text():
+    kinds = [TEXT, IMAGE_ONLY, EMPTY, TEXT, IMAGE_ONLY]
+    assert pages_without_text(kinds, 1, 4) == [2, 3]
+    assert pages_without_text(kinds, 4, 4) == []
+    # Clamped to the document's pages
+    assert pages_without_text(kinds, 0, 10) == [2, 3, 5]
@@ -0,0 +1,45 @@
+import pytest
+
+from benchmarks.synthetic import make_docx
+from docx_reader import iter_docx_blocks, iter_docx_paragraphs
+
+
+@pytest.fixture
+def report(tmp_path):
+    path = str(tmp_path / "report.docx")
+    make_docx(path, 600, table_every=20)
+    return path
+
+
+def test_blocks_concatenate_to_the_paragraphs(report):
+    blocks = list(iter_docx_blocks(report, block_chars=4000))
+    assert len(blocks) > 10
+    text = "".join(block for _, _, block in blocks)
+    assert text.strip() == "\n".join(iter_docx_paragraphs(report)).strip()
+    assert all(block.endswith("\n") for _, _, block in blocks[:-1])
+
+
+def test_block_progress_counts_up_to_the_total(report):
+    progress = [(done, total) for done, total, _ in iter_docx_blocks(report, block_chars=4000)]
+    totals = {total for _, total in progress}
+    assert len(totals) == 1
+    done = [done for done, _ in progress]
+    assert done == sorted(done)
+    assert done[0] < done[-1] == totals.pop()
+
+
+def test_loader_reports_docx_progress(report, monkeypatch):
+    import threading
+    from document_loader import DocumentLoader
+    from document_processor import DocumentProcessor
+    monkeypatch.setattr(DocumentProcessor, "cache", False)
+    monkeypatch.setattr(DocumentProcessor, "search_index", False)
+    progress = []
+    result = []
+    finished = threading.Event()
+    DocumentLoader(report, on_done=lambda loaded: (result.append(loaded), finished.set()),
+                   on_progress=lambda done, total: progress.append(done / total),
+                   ).start()
+    assert finished.wait(30)
+    assert result[0][0] == DocumentProcessor.extract_text_from_docx(report)
+    assert len(progress) > 1 and progress[-1] == 1
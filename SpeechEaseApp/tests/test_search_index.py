@@ -0,0 +1,28 @@
+import search_index
+from search_index import SearchIndex
+
+# One long paragraph spanning two pages
+TEXT = ("Alpha words here. " * 20 + "Omega marks the spot. " + "Filler text. " * 5).strip()
+PAGES = [0, TEXT.index("Omega")]
+
+
+def test_hit_page_comes_from_the_match_offset(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add_document("doc.pdf", None, TEXT, PAGES)
+    hit, = index.search("omega")
+    assert hit["offset"] == TEXT.index("Omega")
+    assert hit["page"] == 2
+    hit, = index.search("alpha")
+    assert hit["page"] == 1
+
+
+def test_known_document_is_not_split_again(tmp_path, monkeypatch):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    content_hash = index.add_document("doc.pdf", None, TEXT, PAGES)
+
+    def split_again(*args, **kwargs):
+        raise AssertionError("document split again")
+
+    monkeypatch.setattr(search_index, "split_into_chunks", split_again)
+    assert index.add_document("copy.pdf", None, TEXT, PAGES) == content_hash
+    assert len(index.search("omega")) == 1
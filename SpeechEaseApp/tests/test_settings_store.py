@@ -0,0 +1,47 @@
+import json
+import time
+
+from settings_store import SettingsStore
+
+
+class CountingStore(SettingsStore):
+    def __init__(self, *args, **kwargs):
+        self.writes = []
+        super().__init__(*args, **kwargs)
+
+    def _write_file(self, settings):
+        self.writes.append(settings)
+        super()._write_file(settings)
+
+
+def test_changes_are_written_once_they_stop(tmp_path):
+    path = tmp_path / "settings.json"
+    store = CountingStore(str(path), delay=0.1)
+    try:
+        for speed in range(10):
+            store.save({"speed": speed})
+        assert store.writes == []
+        deadline = time.monotonic() + 5
+        while not store.writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        assert store.writes == [{"speed": 9}]
+        assert json.loads(path.read_text()) == {"speed": 9}
+    finally:
+        store.close()
+
+
+def test_flush_and_close_write_pending_settings(tmp_path):
+    path = tmp_path / "settings.json"
+    store = CountingStore(str(path), delay=60)
+    try:
+        store.save({"volume": 0.5})
+        store.flush()
+        assert store.load() == {"volume": 0.5}
+        store.save({"volume": 0.7})
+    finally:
+        store.close()
+    assert store.writes == [{"volume": 0.5}, {"volume": 0.7}]
+    assert store.load() == {"volume": 0.7}
+    # No stray temporary files
+    assert [entry.name for entry in tmp_path.iterdir()] == ["settings.json"]
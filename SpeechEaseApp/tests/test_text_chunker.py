@@ -0,0 +1,42 @@
+from text_chunker import chunk_at, split_into_chunks
+
+TEXT = 'He said "Stop!" Then left.\n\nNew paragraph here. Last one?'
+
+
+def test_sentence_spans_index_the_original_text():
+    spans = split_into_chunks(TEXT)
+    assert [TEXT[start:end] for start, end in spans] == [
+        'He said "Stop!"', "Then left.", "New paragraph here.", "Last one?",
+    ]
+
+
+def test_paragraph_spans():
+    spans = split_into_chunks(TEXT, "paragraph")
+    assert [TEXT[start:end] for start, end in spans] == [
+        'He said "Stop!" Then left.', "New paragraph here. Last one?",
+    ]
+
+
+def test_long_chunks_break_at_whitespace():
+    text = " ".join(["word"] * 50) + "."
+    spans = split_into_chunks(text, max_chars=32)
+    assert all(end - start <= 32 for start, end in spans)
+    assert " ".join(text[start:end] for start, end in spans) == text
+    assert all(not text[start].isspace() and not text[end - 1].isspace() for start, end in spans)
+
+
+def test_empty_and_blank_text_have_no_chunks():
+    assert split_into_chunks("") == []
+    assert split_into_chunks(" \n\n ") == []
+
+
+def test_chunk_at():
+    spans = [(0, 10), (11, 20), (22, 30)]
+    assert chunk_at(spans, 0) == 0
+    assert chunk_at(spans, 9) == 0
+    # Offsets between chunks belong to the chunk that follows
+    assert chunk_at(spans, 10) == 1
+    assert chunk_at(spans, 21) == 2
+    assert chunk_at(spans, 30) == len(spans)
+    assert chunk_at([], 5) == 0
+
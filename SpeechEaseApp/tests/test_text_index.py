@@ -0,0 +1,59 @@
+import pytest
+
+from document_library import DocumentLibrary
+from text_chunker import split_into_chunks
+from text_index import TextIndex
+
+# Paragraphs long enough to be split differently at 1000 and 2000 characters
+TEXT = "\n\n".join(("Word " * 300).strip() + "." for _ in range(3))
+
+
+def test_round_trip():
+    text = "First one. Second one.\n\nThird one here. Fourth."
+    index = TextIndex.build(text, [0, 24])
+    loaded = TextIndex.from_bytes(index.to_bytes())
+    assert loaded.length == len(text)
+    assert list(loaded.sentences) == split_into_chunks(text)
+    assert list(loaded.paragraphs) == split_into_chunks(text, "paragraph")
+    assert list(loaded.pages) == [0, 24]
+    assert loaded.page_at(30) == 2
+
+
+def test_skip_sentences():
+    text = "One. Two. Three. Four."
+    index = TextIndex.build(text)
+    two = text.index("Two")
+    assert index.skip_sentences(two, 1) == text.index("Three")
+    assert index.skip_sentences(two + 2, -1) == 0
+    assert index.skip_sentences(two, 0) == two
+    # Clamped to the first and last sentence
+    assert index.skip_sentences(two, -5) == 0
+    assert index.skip_sentences(two, 5) == text.index("Four")
+    assert TextIndex.build("").skip_sentences(0, 1) == 0
+
+
+def test_index_records_its_chunk_size():
+    index = TextIndex.build(TEXT, max_chars=2000)
+    assert index.max_chars == 2000
+    assert list(index.paragraphs) == split_into_chunks(TEXT, "paragraph", 2000)
+    assert TextIndex.from_bytes(index.to_bytes()).max_chars == 2000
+
+
+def test_reader_only_uses_index_paragraphs_of_its_block_size():
+    ft = pytest.importorskip("flet")
+    from document_reader import DocumentReader
+    index = TextIndex.build(TEXT)
+    reader = DocumentReader(TEXT, 16, ft.colors.BLACK, block_chars=2000, index=index)
+    assert list(reader.blocks) == split_into_chunks(TEXT, "paragraph", 2000)
+    reader = DocumentReader(TEXT, 16, ft.colors.BLACK, index=index)
+    assert reader.blocks is index.paragraphs
+
+
+def test_add_document_returns_the_index(tmp_path):
+    library = DocumentLibrary(str(tmp_path / "library.db"))
+    doc, index = library.add_document("doc.txt", None, TEXT)
+    assert list(index.sentences) == split_into_chunks(TEXT)
+    # Adding the same text again returns the stored index
+    same, stored = library.add_document("copy.txt", None, TEXT)
+    assert same["id"] == doc["id"]
+    assert list(stored.paragraphs) == list(index.paragraphs)
@@ -0,0 +1,38 @@
+import codecs
+
+from text_reader import detect_encoding, iter_text_blocks
+
+PARAGRAPHS = [f"Paragraph {n} " + "word " * (n % 7 + 5) for n in range(200)]
+
+
+def write(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_detect_encoding_from_bom(tmp_path):
+    text = "café – naïve"
+    path = write(tmp_path, "u8bom.txt", codecs.BOM_UTF8 + text.encode("utf-8"))
+    assert detect_encoding(path) == "utf-8-sig"
+    assert detect_encoding(write(tmp_path, "u16.txt", text.encode("utf-16"))) == "utf-16"
+    assert "".join(block for _, _, block in iter_text_blocks(path)) == text
+
+
+def test_detect_encoding_falls_back_to_cp1252(tmp_path):
+    text = "“Quoted” café – 50€"
+    assert detect_encoding(write(tmp_path, "utf8.txt", text.encode("utf-8"))) == "utf-8"
+    path = write(tmp_path, "cp1252.txt", text.encode("cp1252"))
+    assert detect_encoding(path) == "cp1252"
+    assert "".join(block for _, _, block in iter_text_blocks(path)) == text
+
+
+def test_blocks_end_on_paragraph_boundaries(tmp_path):
+    text = "\n\n".join(PARAGRAPHS)
+    path = write(tmp_path, "long.txt", text.replace("\n", "\r\n").encode("utf-8"))
+    blocks = list(iter_text_blocks(path, block_chars=500))
+    assert len(blocks) > 10
+    assert "".join(block for _, _, block in blocks) == text
+    assert all(block.endswith("\n\n") for _, _, block in blocks[:-1])
+    assert all(len(block) <= 1000 for _, _, block in blocks)
+    assert blocks[-1][0] == blocks[-1][1]
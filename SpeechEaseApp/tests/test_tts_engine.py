@@ -0,0 +1,293 @@
+import re
+import threading
+import time
+import wave
+
+import pytest
+
+from audio_cache import AudioCache
+from benchmarks.null_tts import NullDriver
+from text_chunker import split_into_chunks
+from tts_engine import IDLE, PAUSED, SPEAKING, TTSEngine
+from tts_pool import TTSPool
+
+
+class RateDriver(NullDriver):
+    """NullDriver whose WAV frame rate records the speaking rate it rendered with"""
+
+    def runAndWait(self):
+        queue = list(self._queue)
+        super().runAndWait()
+        time.sleep(0.002)
+        for kind, _, path in queue:
+            if kind == "file":
+                with wave.open(path, "wb") as wav:
+                    wav.setnchannels(1)
+                    wav.setsampwidth(2)
+                    wav.setframerate(self.properties["rate"] * 40)
+                    wav.writeframes(b"\x00\x00" * 10)
+
+
+class SlowPlayer:
+    """Keeps each chunk "playing" briefly so prefetch renders ahead"""
+
+    def start(self, file_path):
+        pass
+
+    def wait(self):
+        time.sleep(0.005)
+
+    def is_playing(self):
+        return True
+
+    def stop(self):
+        pass
+
+
+def test_rate_changes_during_prefetch_never_poison_the_cache(tmp_path):
+    text = " ".join(f"Sentence number {i} is here." for i in range(100))
+    engine = TTSEngine(driver_factory=RateDriver)
+    engine.player = SlowPlayer()
+    engine.audio_cache = AudioCache(str(tmp_path))
+    done = threading.Event()
+    engine.on_state_change = lambda state: state == IDLE and done.set()
+    rates = [0.5 + i / 10 for i in range(10)]
+    try:
+        engine.speak(text)
+        changes = 0
+        while not done.wait(0.003):
+            engine.set_rate(rates[changes % len(rates)])
+            changes += 1
+        checked = 0
+        for start, end in split_into_chunks(text):
+            for rate in rates:
+                key = engine.audio_cache.make_key(text[start:end], "default", rate, 1.0)
+                path = engine.audio_cache.get(key)
+                if path is None:
+                    continue
+                with wave.open(path) as wav:
+                    assert wav.getframerate() == int(200 * rate) * 40
+                checked += 1
+        assert checked
+    finally:
+        engine.shutdown()
+
+
+class RenderWordsDriver(NullDriver):
+    """NullDriver that, like eSpeak, also fires word events while saving to a file"""
+
+    def runAndWait(self):
+        for kind, text, _ in self._queue:
+            if kind == "file":
+                for callback in self._callbacks.get("started-word", []):
+                    callback(None, 0, len(text))
+        super().runAndWait()
+
+
+class NullPlayer:
+    def start(self, file_path):
+        pass
+
+    def wait(self):
+        pass
+
+    def is_playing(self):
+        return False
+
+    def stop(self):
+        pass
+
+
+def speak_and_collect(engine, text):
+    words = []
+    done = threading.Event()
+    engine.on_state_change = lambda state: state == IDLE and done.set()
+    engine.speak(text, on_word=lambda offset, length: words.append((offset, length)))
+    assert done.wait(10)
+    return words
+
+
+def test_render_word_events_do_not_reach_on_word(tmp_path):
+    text = "First sentence here. Second one follows. And a third."
+    engine = TTSEngine(driver_factory=RenderWordsDriver)
+    engine.player = NullPlayer()
+    engine.audio_cache = AudioCache(str(tmp_path))
+    try:
+        words = speak_and_collect(engine, text)
+        # NullPlayer finishes at once, so each chunk only reports its first word
+        first_words = [(start, text.index(" ", start) - start)
+                       for start, _ in split_into_chunks(text)]
+        assert words == first_words
+    finally:
+        engine.shutdown()
+
+
+class ShortWavDriver(NullDriver):
+    """NullDriver whose renders last 5 ms per character"""
+
+    def runAndWait(self):
+        queue = list(self._queue)
+        super().runAndWait()
+        for kind, text, path in queue:
+            if kind == "file":
+                with wave.open(path, "wb") as wav:
+                    wav.setnchannels(1)
+                    wav.setsampwidth(2)
+                    wav.setframerate(8000)
+                    wav.writeframes(b"\x00\x00" * 40 * len(text))
+
+
+class ClockPlayer:
+    """Plays each chunk for its WAV duration in real time"""
+
+    def __init__(self):
+        self.ends = 0.0
+
+    def start(self, file_path):
+        with wave.open(file_path) as wav:
+            self.ends = time.perf_counter() + wav.getnframes() / wav.getframerate()
+
+    def wait(self):
+        time.sleep(max(0.0, self.ends - time.perf_counter()))
+
+    def is_playing(self):
+        return time.perf_counter() < self.ends
+
+    def stop(self):
+        self.ends = 0.0
+
+
+def test_played_chunks_report_words_over_their_duration(tmp_path):
+    text = "First sentence is somewhat longer here. Second one follows it now."
+    engine = TTSEngine(driver_factory=ShortWavDriver)
+    engine.player = ClockPlayer()
+    engine.audio_cache = AudioCache(str(tmp_path))
+    try:
+        words = speak_and_collect(engine, text)
+        spoken = [(match.start(), match.end() - match.start())
+                  for match in re.finditer(r"\S+", text)]
+        assert set(words) <= set(spoken)
+        assert words == sorted(words)
+        # More than one event per sentence, starting with each first word
+        assert len(words) > len(split_into_chunks(text))
+        assert (text.index("Second"), len("Second")) in words
+    finally:
+        engine.shutdown()
+
+
+def test_spoken_words_reach_on_word():
+    text = "First sentence here. Second one follows."
+    engine = TTSEngine(driver_factory=RenderWordsDriver)
+    engine.player = None
+    try:
+        words = speak_and_collect(engine, text)
+        assert [text[offset:offset + length] for offset, length in words] == text.split()
+    finally:
+        engine.shutdown()
+
+
+class SlowSpeechDriver(NullDriver):
+    """NullDriver that takes a while per word and records each chunk it starts"""
+
+    def __init__(self):
+        super().__init__()
+        self.said = []
+
+    def runAndWait(self):
+        self._stopped.clear()
+        queue, self._queue = self._queue, []
+        for kind, text, _ in queue:
+            self.said.append(text)
+            for word in text.split():
+                time.sleep(0.02)
+                for callback in self._callbacks.get("started-word", []):
+                    callback(None, 0, len(word))
+                if self._stopped.is_set():
+                    return
+
+
+class StateRecorder:
+    def __init__(self, engine):
+        self.states = []
+        self._cond = threading.Condition()
+        engine.on_state_change = self.record
+
+    def record(self, state):
+        with self._cond:
+            self.states.append(state)
+            self._cond.notify_all()
+
+    def wait_for(self, state, count=1):
+        with self._cond:
+            assert self._cond.wait_for(lambda: self.states.count(state) >= count, 10)
+
+
+def test_pause_resume_and_stop_move_between_states():
+    text = "One two three four. Five six seven eight. Nine ten eleven twelve."
+    engine = TTSEngine(driver_factory=SlowSpeechDriver)
+    engine.player = None
+    recorder = StateRecorder(engine)
+    try:
+        # Nothing to pause or resume yet
+        engine.pause()
+        engine.resume()
+        engine.speak(text)
+        recorder.wait_for(SPEAKING)
+        deadline = time.monotonic() + 10
+        while not engine.engine.said and time.monotonic() < deadline:
+            time.sleep(0.001)
+        engine.pause()
+        recorder.wait_for(PAUSED)
+        assert engine.is_paused and engine.is_speaking
+        assert engine.current_position == 0
+        engine.resume()
+        recorder.wait_for(IDLE)
+        assert recorder.states == [SPEAKING, PAUSED, SPEAKING, IDLE]
+        # The interrupted sentence is spoken again from its start
+        sentences = [text[start:end] for start, end in split_into_chunks(text)]
+        assert engine.engine.said == sentences[:1] + sentences
+
+        engine.speak(text, start_position=text.index("Five"))
+        recorder.wait_for(SPEAKING, 3)
+        engine.stop()
+        recorder.wait_for(IDLE, 2)
+        assert not engine.is_speaking
+        assert engine.current_position == 0
+    finally:
+        engine.shutdown()
+
+
+def broken_driver():
+    raise OSError("eSpeak is not installed")
+
+
+def test_missing_driver_fails_renders_and_reports_idle(tmp_path):
+    engine = TTSEngine(driver_factory=broken_driver)
+    engine.player = None
+    recorder = StateRecorder(engine)
+    try:
+        with pytest.raises(RuntimeError, match="Speech driver is not available"):
+            engine.save_to_file("Hello.", str(tmp_path / "hello.wav"))
+        engine.speak("Hello there.")
+        recorder.wait_for(IDLE)
+        assert recorder.states == [IDLE]
+        assert not engine.is_speaking
+    finally:
+        engine.shutdown()
+
+
+def test_pooled_engine_speaks_and_renders_in_worker_processes(tmp_path):
+    text = "First sentence here. Second one follows."
+    pool = TTSPool(workers=1, driver_factory=NullDriver)
+    engine = TTSEngine(pool=pool)
+    engine.player = None
+    try:
+        words = speak_and_collect(engine, text)
+        assert [text[offset:offset + length] for offset, length in words] == text.split()
+        path = str(tmp_path / "render.wav")
+        engine.save_to_file(text, path)
+        with wave.open(path) as wav:
+            assert wav.getnframes() > 0
+    finally:
+        engine.shutdown()
+        pool.shutdown()
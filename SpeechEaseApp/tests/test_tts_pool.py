@@ -0,0 +1,111 @@
+import functools
+import os
+import threading
+import time
+
+import pytest
+
+import metrics
+from benchmarks.null_tts import NullDriver
+from tts_pool import TTSPool
+
+# Jobs run in worker processes, so they are module-level functions
+
+
+def process_id(engine):
+    return os.getpid()
+
+
+def fail(engine):
+    raise ValueError("job failed")
+
+
+def wait_for(path, engine):
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return os.getpid()
+
+
+def start_and_wait(started, gate, engine):
+    open(started, "w").close()
+    return wait_for(gate, engine)
+
+
+@pytest.fixture
+def gauges():
+    metrics.reset()
+    metrics.enable()
+
+    def read():
+        return {
+            (gauge["name"], gauge["labels"].get("session")): gauge["value"]
+            for gauge in metrics.snapshot()["gauges"]
+        }
+
+    yield read
+    metrics.disable()
+    metrics.reset()
+
+
+def test_default_pool_has_a_worker_per_cpu():
+    assert TTSPool().size == (os.cpu_count() or 1)
+
+
+def test_jobs_run_in_parallel_worker_processes(tmp_path):
+    pool = TTSPool(workers=2, driver_factory=NullDriver)
+    started, gate = str(tmp_path / "started"), str(tmp_path / "gate")
+    blocked = []
+    thread = threading.Thread(target=lambda: blocked.append(
+        pool.lease("a").run(functools.partial(start_and_wait, started, gate), {})))
+    try:
+        thread.start()
+        wait_for(started, None)
+        # Answered by the other worker while the first one is still busy
+        other = pool.lease("b").run(process_id, {})
+        assert not os.path.exists(gate)
+        open(gate, "w").close()
+        thread.join(10)
+        assert blocked and len({blocked[0], other, os.getpid()}) == 3
+    finally:
+        pool.shutdown()
+        thread.join(10)
+
+
+def test_job_errors_reach_the_caller():
+    pool = TTSPool(workers=1, driver_factory=NullDriver)
+    try:
+        with pytest.raises(ValueError, match="job failed"):
+            pool.lease().run(fail, {})
+        assert pool.lease().run(process_id, {}) != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+def test_busy_session_does_not_starve_others(tmp_path, gauges):
+    pool = TTSPool(workers=2, driver_factory=NullDriver)
+    started, gate = str(tmp_path / "started"), str(tmp_path / "gate")
+    job = functools.partial(start_and_wait, started, gate)
+    busy = pool.lease("busy")
+    busy_threads = [threading.Thread(target=busy.run, args=(job, {})) for _ in range(3)]
+    try:
+        for thread in busy_threads:
+            thread.start()
+        wait_for(started, None)
+        # The busy session holds one worker and has two jobs queued behind
+        # its limit; the other session's jobs all go through the free worker
+        other = pool.lease("other")
+        for _ in range(5):
+            other.run(process_id, {})
+        assert not os.path.exists(gate)
+        values = gauges()
+        assert values[("speechease_tts_pool_session_queue_depth", "busy")] == 2
+        assert values[("speechease_tts_pool_queue_depth", None)] == 2
+        assert values[("speechease_tts_pool_workers", None)] == 2
+    finally:
+        open(gate, "w").close()
+        for thread in busy_threads:
+            thread.join(10)
+        pool.shutdown()
+    assert not any(thread.is_alive() for thread in busy_threads)
+    assert ("speechease_tts_pool_session_queue_depth", "busy") not in gauges()
@@ -0,0 +1,54 @@
+import re
+from typing import List, Sequence, Tuple
+
+# A sentence runs up to terminal punctuation (plus closing quotes or
+# brackets) followed by whitespace, a paragraph break, or the end of text.
+_SENTENCE = re.compile(r'\S.*?(?:[.!?]+["\')\]]*(?=\s|\Z)|(?=\n\s*\n)|\Z)', re.S)
+_PARAGRAPH = re.compile(r'\S.*?(?=\n\s*\n|\Z)', re.S)
+
+CHUNK_MODES = ("sentence", "paragraph")
+# Longest chunk split_into_chunks() returns by default
+MAX_CHUNK_CHARS = 1000
+
+
+def split_into_chunks(text: str, mode: str = "sentence",
+                      max_chars: int = MAX_CHUNK_CHARS) -> List[Tuple[int, int]]:
+    """Split text into (start, end) spans of sentences or paragraphs
+
+    Spans index into the original string so callers can slice lazily and map
+    a chunk back to a character offset. Chunks longer than max_chars are
+    broken at the last whitespace that fits.
+    """
+    pattern = _PARAGRAPH if mode == "paragraph" else _SENTENCE
+    spans = []
+    for match in pattern.finditer(text):
+        start, end = match.start(), match.end()
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        while end - start > max_chars:
+            cut = text.rfind(" ", start + 1, start + max_chars)
+            if cut == -1:
+                cut = start + max_chars
+            spans.append((start, cut))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if end > start:
+            spans.append((start, end))
+    return spans
+
+
+def chunk_at(spans: Sequence[Tuple[int, int]], position: int) -> int:
+    """Return the index of the chunk containing (or following) a character offset
+
+    Spans are sorted and non-overlapping, so this is a binary search on
+    their ends.
+    """
+    low, high = 0, len(spans)
+    while low < high:
+        middle = (low + high) // 2
+        if position < spans[middle][1]:
+            high = middle
+        else:
+            low = middle + 1
+    return low
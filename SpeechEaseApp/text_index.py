@@ -0,0 +1,151 @@
+import bisect
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from text_chunker import MAX_CHUNK_CHARS, split_into_chunks
+
+# Serialized layout: magic, text length, the chunk size, then the number of
+# sentences, paragraphs and pages, followed by the arrays (little-endian
+# int64)
+_HEADER = struct.Struct("<4sqIIII")
+_MAGIC = b"SEI1"
+
+
+def _int_array(values: Iterable[int] = ()) -> array:
+    return array('q', values)
+
+
+class SpanArray:
+    """Read-only sequence of (start, end) character spans backed by two arrays
+
+    Behaves like the list split_into_chunks() returns, at 16 bytes per span
+    instead of a tuple and two ints each, and span_at() is a binary search.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts: Optional[array] = None, ends: Optional[array] = None):
+        self.starts = starts if starts is not None else _int_array()
+        self.ends = ends if ends is not None else _int_array()
+
+    @classmethod
+    def from_spans(cls, spans: Iterable[Tuple[int, int]]) -> "SpanArray":
+        result = cls()
+        for start, end in spans:
+            result.starts.append(start)
+            result.ends.append(end)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SpanArray(self.starts[index], self.ends[index])
+        return self.starts[index], self.ends[index]
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def span_at(self, position: int) -> int:
+        """Index of the span containing (or following) a character offset
+
+        Same result as text_chunker.chunk_at(): len(self) past the last span.
+        """
+        return bisect.bisect_right(self.ends, position)
+
+
+class TextIndex:
+    """Sentence, paragraph and page boundaries of a document's text
+
+    Computed once per document (see build()) and stored with the text in
+    the library, so seeking, highlighting and resuming never rescan the
+    text. Sentences are the spans TTSEngine speaks in "sentence" mode and
+    paragraphs those of "paragraph" mode, the reader's blocks and the
+    search index's passages. Pages holds the start offset of each page, and
+    max_chars the chunk size the spans were split with.
+    """
+
+    def __init__(self, length: int, sentences: SpanArray, paragraphs: SpanArray,
+                 pages: array, max_chars: int = MAX_CHUNK_CHARS):
+        self.length = length
+        self.sentences = sentences
+        self.paragraphs = paragraphs
+        self.pages = pages
+        self.max_chars = max_chars
+
+    @classmethod
+    def build(cls, text: str, page_offsets: Optional[List[int]] = None,
+              max_chars: int = MAX_CHUNK_CHARS) -> "TextIndex":
+        return cls(
+            len(text),
+            SpanArray.from_spans(split_into_chunks(text, "sentence", max_chars)),
+            SpanArray.from_spans(split_into_chunks(text, "paragraph", max_chars)),
+            _int_array(page_offsets or [0]),
+            max_chars,
+        )
+
+    def spans(self, mode: str) -> SpanArray:
+        """The spans for a text_chunker chunk mode"""
+        return self.paragraphs if mode == "paragraph" else self.sentences
+
+    def sentence_at(self, offset: int) -> int:
+        """Index of the sentence containing an offset, clamped to the last one"""
+        return max(0, min(self.sentences.span_at(offset), len(self.sentences) - 1))
+
+    def paragraph_at(self, offset: int) -> int:
+        """Index of the paragraph containing an offset, clamped to the last one"""
+        return max(0, min(self.paragraphs.span_at(offset), len(self.paragraphs) - 1))
+
+    def page_at(self, offset: int) -> int:
+        """1-based number of the page containing an offset"""
+        return max(1, bisect.bisect_right(self.pages, offset))
+
+    def sentence_start(self, offset: int) -> int:
+        """Start of the sentence containing an offset, e.g. to resume reading there"""
+        if not self.sentences:
+            return 0
+        return self.sentences.starts[self.sentence_at(offset)]
+
+    def skip_sentences(self, offset: int, count: int) -> int:
+        """Start of the sentence `count` sentences before or after the one at offset"""
+        if not self.sentences:
+            return 0
+        index = max(0, min(self.sentence_at(offset) + count, len(self.sentences) - 1))
+        return self.sentences.starts[index]
+
+    def page_start(self, page: int) -> int:
+        """Offset where a 1-based page number starts, clamped to the page range"""
+        return self.pages[max(0, min(page - 1, len(self.pages) - 1))]
+
+    def to_bytes(self) -> bytes:
+        arrays = [self.sentences.starts, self.sentences.ends,
+                  self.paragraphs.starts, self.paragraphs.ends, self.pages]
+        if sys.byteorder == "big":
+            arrays = [array('q', values) for values in arrays]
+            for values in arrays:
+                values.byteswap()
+        header = _HEADER.pack(_MAGIC, self.length, self.max_chars, len(self.sentences),
+                              len(self.paragraphs), len(self.pages))
+        return zlib.compress(header + b"".join(values.tobytes() for values in arrays))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TextIndex":
+        data = zlib.decompress(data)
+        magic, length, max_chars, sentences, paragraphs, pages = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Unknown text index format")
+        arrays = []
+        position = _HEADER.size
+        for count in (sentences, sentences, paragraphs, paragraphs, pages):
+            values = _int_array()
+            values.frombytes(data[position:position + count * 8])
+            if sys.byteorder == "big":
+                values.byteswap()
+            arrays.append(values)
+            position += count * 8
+        return cls(length, SpanArray(arrays[0], arrays[1]),
+                   SpanArray(arrays[2], arrays[3]), arrays[4], max_chars)
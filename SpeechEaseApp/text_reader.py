@@ -0,0 +1,78 @@
+import codecs
+import os
+from typing import Iterator, Optional, Tuple
+
+# Bytes inspected by detect_encoding()
+SAMPLE_BYTES = 64 * 1024
+# Characters read per block by iter_text_blocks()
+BLOCK_CHARS = 1024 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def detect_encoding(file_path: str, sample_bytes: int = SAMPLE_BYTES) -> str:
+    """Guess a text file's encoding from its byte-order mark or a sampled prefix
+
+    Files with a BOM use the matching Unicode codec. Otherwise the sample
+    is tried as UTF-8, then Windows-1252, and Latin-1 (which accepts any
+    byte) is the last resort.
+    """
+    with open(file_path, 'rb') as file:
+        sample = file.read(sample_bytes)
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    for encoding in ('utf-8', 'cp1252'):
+        try:
+            # final=False tolerates a character cut off at the end of the sample
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1'
+
+
+def _split_point(text: str) -> int:
+    """Where to end a block: after the last blank line, else the last newline"""
+    index = text.rfind('\n\n')
+    if index >= 0:
+        return index + 2
+    index = text.rfind('\n')
+    if index >= 0:
+        return index + 1
+    return len(text)
+
+
+def iter_text_blocks(file_path: str, encoding: Optional[str] = None,
+                     block_chars: int = BLOCK_CHARS) -> Iterator[Tuple[int, int, str]]:
+    """Yield (bytes_read, total_bytes, text) blocks of a text file
+
+    Blocks concatenate to the whole decoded file (with newlines normalized
+    to \\n) and end on paragraph boundaries where possible, so no paragraph
+    is split unless it alone exceeds the block size. At most about two
+    blocks are held at a time, whatever the file size. Undecodable bytes
+    become U+FFFD instead of failing the read.
+    """
+    if encoding is None:
+        encoding = detect_encoding(file_path)
+    total = os.path.getsize(file_path)
+    with open(file_path, 'r', encoding=encoding, errors='replace', newline=None) as file:
+        carry = ""
+        while True:
+            chunk = file.read(block_chars)
+            if not chunk:
+                break
+            text = carry + chunk
+            cut = _split_point(text)
+            carry = text[cut:]
+            if cut:
+                yield file.buffer.tell(), total, text[:cut]
+        if carry:
+            yield total, total, carry
+
@@ -1,90 +1,571 @@
-import pyttsx3
+import functools
+import os
+import queue
+import re
+import tempfile
 import threading
-from typing import Callable, Optional
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import metrics
+from audio_cache import AudioCache
+from audio_format import ensure_wav
+from audio_player import create_local_player
+from text_chunker import chunk_at, split_into_chunks
+from text_index import TextIndex
+from tts_pool import PoolLease, TTSPool, resolve_voice
+
+# Engine states, reported to on_state_change
+IDLE = "idle"
+SPEAKING = "speaking"
+PAUSED = "paused"
+
+_WORD = re.compile(r"\S+")
+
+
+def _say(text: str, engine):
+    engine.say(text)
+    engine.runAndWait()
+
+
+def _render(text: str, file_path: str, engine):
+    engine.save_to_file(text, file_path)
+    engine.runAndWait()
+
+
+def _wav_duration(file_path: str) -> float:
+    with wave.open(file_path, 'rb') as wav:
+        return wav.getnframes() / float(wav.getframerate() or 1)
+
+
+class SpeakCommand(NamedTuple):
+    text: str
+    start_position: int
+    on_word: Optional[Callable]
+    index: Optional[TextIndex] = None
+
+
+class PauseCommand(NamedTuple):
+    pass
+
+
+class ResumeCommand(NamedTuple):
+    pass
+
+
+class StopCommand(NamedTuple):
+    pass
+
+
+class ShutdownCommand(NamedTuple):
+    pass
+
+
+class SetPropertyCommand(NamedTuple):
+    name: str
+    value: Any
+
+
+class CallCommand(NamedTuple):
+    """Run func(engine) on the engine thread and report through future
+
+    With uses_driver=False, func() is called without the driver, for work
+    that must see the settings the engine thread has applied.
+    """
+    func: Callable
+    future: Future
+    uses_driver: bool = True
+
 
 class TTSEngine:
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.is_speaking = False
-        self.is_paused = False
+    """Text-to-speech front end with one long-lived engine thread.
+
+    The pyttsx3 driver is created and used only on that thread, which
+    is started by start() or the first command that needs it, so creating
+    a TTSEngine costs nothing at startup. Public
+    methods enqueue typed commands and return immediately; the thread
+    handles them between chunks, and a pending pause, stop or new speak
+    also interrupts the chunk being spoken at the next word boundary.
+    State changes (idle, speaking, paused) are reported to on_state_change.
+
+    Given a TTSPool, the engine thread owns no driver of its own: speech
+    and rendering run as jobs on the pool's worker processes, carrying this
+    engine's voice, rate and volume with them.
+    """
+
+    def __init__(self, pool: Optional[TTSPool] = None,
+                 driver_factory: Optional[Callable[[], Any]] = None):
+        self.engine = None
+        self.pool = pool
+        # Creates the speech driver on the engine thread; pyttsx3.init by
+        # default. Anything with pyttsx3's driver interface will do.
+        self.driver_factory = driver_factory
+        self._lease: Optional[PoolLease] = None
+        self.state = IDLE
+        self.on_state_change: Optional[Callable[[str], None]] = None
         self.current_text = ""
         self.current_position = 0
         self.on_word_callback: Optional[Callable] = None
-        
+        # Text is queued to the engine one chunk at a time so that pause and
+        # resume can pick up at the current chunk. None speaks it in one go.
+        self.chunk_mode: Optional[str] = "sentence"
+        self.chunks: Sequence[Tuple[int, int]] = []
+        self.current_chunk = 0
+        # Parameters that rendered audio depends on, used as cache keys
+        self.voice = "default"
+        self.rate = 1.0
+        self.volume = 1.0
+        self.voices = []
+        # When a player is available, chunks are rendered to WAV through
+        # the audio cache and played from there, so replaying a document
+        # reuses audio instead of synthesizing it again. The default plays
+        # on this machine's speakers; assign a browser_player.BrowserPlayer
+        # to stream to a web client instead.
+        self.audio_cache: Optional[AudioCache] = None
+        self.player = create_local_player()
+        # While a chunk plays, up to prefetch_depth following chunks are
+        # rendered ahead, as long as the prefetched audio stays within
+        # prefetch_budget bytes. Prefetched chunks are dropped on seek,
+        # stop and voice/rate/volume changes.
+        self.prefetch_depth = 2
+        self.prefetch_budget = 32 * 1024 * 1024
+        self._prefetched: Dict[int, Tuple[str, int]] = {}
+        self._prefetched_bytes = 0
+        # Silence between one chunk finishing and the next starting, in
+        # seconds, for tuning prefetch_depth (see gap_stats())
+        self.gaps: "deque[float]" = deque(maxlen=1000)
+        self._last_chunk_end: Optional[float] = None
+        # Labels for this engine's metrics, e.g. {"session": ...}
+        self.metrics_labels = {}
+        self._speak_requested: Optional[float] = None
+        # pyttsx3 reports word offsets relative to the utterance (one chunk)
+        self._chunk_start = 0
+        # True while the driver speaks a chunk aloud; word events from
+        # save_to_file renders (cache fills, prefetch) are not progress
+        self._saying = False
+        self._commands: "queue.Queue[Any]" = queue.Queue()
+        self._interrupt = threading.Event()
+        self._ready = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="tts-engine")
+        self._thread.daemon = True
+
+    def start(self):
+        """Start the engine thread and driver initialization, if not already running"""
+        with self._start_lock:
+            if self._thread.ident is None:
+                self._thread.start()
+
+    @property
+    def is_speaking(self) -> bool:
+        """True while speaking or paused, as before the engine thread existed"""
+        return self.state != IDLE
+
+    @property
+    def is_paused(self) -> bool:
+        return self.state == PAUSED
+
+    # Commands (safe to call from any thread)
+
+    def _send(self, command, interrupt: bool = False):
+        if isinstance(command, ShutdownCommand) and not self._thread.is_alive():
+            return
+        if not isinstance(command, SetPropertyCommand):
+            # Property changes just wait in the queue until the thread runs
+            self.start()
+        if interrupt and self.state == SPEAKING:
+            self._interrupt.set()
+            if self.player is not None:
+                self.player.stop()
+        self._commands.put(command)
+
+    # voice, rate and volume are the audio cache key, so they change on the
+    # engine thread together with the driver, never ahead of it
+
     def set_voice(self, voice_id: str):
         """Set the voice for TTS"""
-        voices = self.engine.getProperty('voices')
-        if voice_id == "male":
-            # Try to find a male voice
-            for voice in voices:
-                if 'male' in voice.name.lower() or 'david' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
-                    return
-        elif voice_id == "female":
-            # Try to find a female voice
-            for voice in voices:
-                if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                    self.engine.setProperty('voice', voice.id)
-                    return
-        # Default voice
-        if voices:
-            self.engine.setProperty('voice', voices[0].id)
-    
+        self._send(SetPropertyCommand('voice', voice_id))
+
     def set_rate(self, rate: float):
         """Set speaking rate (0.5 to 2.0)"""
-        # Convert to pyttsx3 rate (typically 100-300)
-        pyttsx_rate = int(200 * rate)
-        self.engine.setProperty('rate', pyttsx_rate)
-    
+        self._send(SetPropertyCommand('rate', rate))
+
     def set_volume(self, volume: float):
         """Set volume (0.0 to 1.0)"""
-        self.engine.setProperty('volume', volume)
-    
-    def speak(self, text: str, on_word: Optional[Callable] = None):
-        """Speak the given text"""
-        if self.is_speaking:
-            self.stop()
-        
-        self.current_text = text
-        self.on_word_callback = on_word
-        self.is_speaking = True
-        self.is_paused = False
-        
-        def speak_thread():
-            try:
-                self.engine.say(text)
-                self.engine.runAndWait()
-            except Exception as e:
-                print(f"TTS Error: {e}")
-            finally:
-                self.is_speaking = False
-                self.is_paused = False
-        
-        thread = threading.Thread(target=speak_thread)
-        thread.daemon = True
-        thread.start()
-    
+        self._send(SetPropertyCommand('volume', volume))
+
+    def speak(self, text: str, on_word: Optional[Callable] = None, start_position: int = 0,
+              index: Optional[TextIndex] = None):
+        """Speak the given text, starting from a character offset
+
+        Pass the text's TextIndex to reuse its precomputed chunks instead
+        of splitting the text again.
+        """
+        metrics.increment("speechease_tts_commands_total", command="speak", **self.metrics_labels)
+        self._speak_requested = time.perf_counter()
+        self._send(SpeakCommand(text, start_position, on_word, index), interrupt=True)
+
     def pause(self):
-        """Pause speaking"""
-        if self.is_speaking and not self.is_paused:
-            self.engine.stop()
-            self.is_paused = True
-    
+        """Pause speaking, keeping the current chunk for resume()"""
+        metrics.increment("speechease_tts_commands_total", command="pause", **self.metrics_labels)
+        self._send(PauseCommand(), interrupt=True)
+
     def resume(self):
-        """Resume speaking"""
-        if self.is_paused:
-            self.is_paused = False
-            # Note: pyttsx3 doesn't support true pause/resume
-            # This is a limitation of the library
-    
+        """Resume speaking from the start of the chunk that was interrupted"""
+        metrics.increment("speechease_tts_commands_total", command="resume", **self.metrics_labels)
+        self._speak_requested = time.perf_counter()
+        self._send(ResumeCommand())
+
     def stop(self):
-        """Stop speaking"""
-        if self.is_speaking:
-            self.engine.stop()
-            self.is_speaking = False
-            self.is_paused = False
-    
+        """Stop speaking and rewind to the beginning"""
+        metrics.increment("speechease_tts_commands_total", command="stop", **self.metrics_labels)
+        self._send(StopCommand(), interrupt=True)
+
+    def shutdown(self):
+        """Stop speaking and end the engine thread (e.g. when a session closes)"""
+        self._send(ShutdownCommand(), interrupt=True)
+
+    def call(self, func: Callable, timeout: Optional[float] = None):
+        """Run func(engine) on the engine thread and return its result
+
+        With a pool, func runs in a worker process and must be picklable.
+        """
+        if threading.current_thread() is self._thread:
+            return self._run_driver(func)
+        future: Future = Future()
+        self._send(CallCommand(func, future))
+        return future.result(timeout)
+
+    def _on_engine_thread(self, func: Callable):
+        """Run func() on the engine thread, after any queued setting changes"""
+        if threading.current_thread() is self._thread:
+            return func()
+        future: Future = Future()
+        self._send(CallCommand(func, future, uses_driver=False))
+        return future.result()
+
+    def save_to_file(self, text: str, file_path: str):
+        """Render text to a WAV file instead of the speakers (blocking)"""
+        self.call(functools.partial(_render, text, file_path))
+        ensure_wav(file_path)
+
     def get_voices(self):
         """Get available voices"""
-        voices = self.engine.getProperty('voices')
-        return [(voice.id, voice.name) for voice in voices] if voices else []
+        self.start()
+        self._ready.wait()
+        return [(voice.id, voice.name) for voice in self.voices]
+
+    def gap_stats(self) -> dict:
+        """Summary of recent inter-chunk gaps in milliseconds"""
+        gaps = sorted(self.gaps)
+        if not gaps:
+            return {"count": 0}
+        return {
+            "count": len(gaps),
+            "mean_ms": 1000 * sum(gaps) / len(gaps),
+            "p50_ms": 1000 * gaps[len(gaps) // 2],
+            "p95_ms": 1000 * gaps[min(len(gaps) - 1, int(len(gaps) * 0.95))],
+            "max_ms": 1000 * gaps[-1],
+        }
+
+    # Engine thread
+
+    def _set_state(self, state: str, always: bool = False):
+        """Change state and tell on_state_change; with always, even if unchanged"""
+        if state == self.state and not always:
+            return
+        self.state = state
+        if self.on_state_change:
+            try:
+                self.on_state_change(state)
+            except Exception as e:
+                print(f"State callback error: {e}")
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            if self.pool is not None:
+                # Pool queue depth is reported per session, like other metrics
+                self._lease = self.pool.lease(self.metrics_labels.get("session", id(self)))
+                self.voices = self.pool.get_voices()
+            else:
+                if self.driver_factory is None:
+                    import pyttsx3
+                    self.driver_factory = pyttsx3.init
+                self.engine = self.driver_factory()
+                self.engine.connect('started-word', self._on_started_word)
+                self.voices = self.engine.getProperty('voices') or []
+        except Exception as e:
+            print(f"TTS Error: {e}")
+        finally:
+            metrics.observe("speechease_tts_startup_seconds",
+                            time.perf_counter() - started, **self.metrics_labels)
+            self._ready.set()
+
+        while True:
+            if self.state == SPEAKING:
+                try:
+                    command = self._commands.get_nowait()
+                except queue.Empty:
+                    self._interrupt.clear()
+                    self._speak_current_chunk()
+                    continue
+            else:
+                command = self._commands.get()
+            if isinstance(command, ShutdownCommand):
+                self._set_state(IDLE)
+                if self._lease is not None:
+                    self._lease.release()
+                return
+            self._handle(command)
+
+    def _run_driver(self, func: Callable, interruptible: bool = False):
+        """Run func(engine) on our own driver, or as a job on the pool"""
+        if self._lease is None:
+            if self.engine is None:
+                raise RuntimeError("Speech driver is not available")
+            return func(self.engine)
+        return self._lease.run(
+            func,
+            {'voice': self.voice, 'rate': int(200 * self.rate), 'volume': self.volume},
+            on_word=self._on_pooled_word if interruptible else None,
+            interrupt=self._interrupt if interruptible else None,
+        )
+
+    def _handle(self, command):
+        if isinstance(command, CallCommand):
+            if not command.future.set_running_or_notify_cancel():
+                return
+            try:
+                if command.uses_driver:
+                    command.future.set_result(self._run_driver(command.func))
+                else:
+                    command.future.set_result(command.func())
+            except Exception as e:
+                command.future.set_exception(e)
+            return
+        # Anything that reaches here interrupted or reconfigured playback,
+        # so the next chunk start is not a gap in continuous playback
+        self._last_chunk_end = None
+        if isinstance(command, SetPropertyCommand):
+            # Recorded even without a driver, so the settings stay current
+            self._apply_property(command.name, command.value)
+            return
+        if self.engine is None and self._lease is None:
+            if isinstance(command, (SpeakCommand, ResumeCommand)):
+                # Callers may already show playback as started
+                print("TTS Error: Speech driver is not available")
+                self._set_state(IDLE, always=True)
+            return
+        if isinstance(command, SpeakCommand):
+            self._discard_prefetch()
+            self.current_text = command.text
+            self.on_word_callback = command.on_word
+            if (self.chunk_mode and command.index is not None
+                    and command.index.length == len(command.text)):
+                self.chunks = command.index.spans(self.chunk_mode)
+            elif self.chunk_mode:
+                self.chunks = split_into_chunks(command.text, self.chunk_mode)
+            else:
+                self.chunks = [(0, len(command.text))]
+            self.current_chunk = chunk_at(self.chunks, command.start_position)
+            self._set_state(SPEAKING)
+        elif isinstance(command, PauseCommand):
+            if self.state == SPEAKING:
+                self._set_state(PAUSED)
+        elif isinstance(command, ResumeCommand):
+            if self.state == PAUSED:
+                self._set_state(SPEAKING)
+        elif isinstance(command, StopCommand):
+            self._discard_prefetch()
+            self.current_chunk = 0
+            self.current_position = 0
+            self._set_state(IDLE)
+
+    def _apply_property(self, name: str, value):
+        # Prefetched audio was rendered with the old settings
+        self._discard_prefetch()
+        setattr(self, name, value)
+        if self._lease is not None:
+            # Pool jobs pick up voice, rate and volume when they run
+            return
+        if self.engine is None:
+            return
+        try:
+            if name == 'voice':
+                self._apply_voice(value)
+            elif name == 'rate':
+                # Convert to pyttsx3 rate (typically 100-300)
+                self.engine.setProperty('rate', int(200 * value))
+            else:
+                self.engine.setProperty(name, value)
+        except Exception as e:
+            print(f"TTS Error: {e}")
+
+    def _apply_voice(self, voice_name: str):
+        voice_id = resolve_voice(self.voices, voice_name)
+        if voice_id is not None:
+            self.engine.setProperty('voice', voice_id)
+
+    def _speak_current_chunk(self):
+        if self.current_chunk >= len(self.chunks):
+            # Reached the end of the text: rewind
+            self.current_chunk = 0
+            self.current_position = 0
+            self._set_state(IDLE)
+            return
+        start, end = self.chunks[self.current_chunk]
+        self.current_position = start
+        self._chunk_start = start
+        try:
+            if self.player is not None:
+                path = self._take_prefetched(self.current_chunk)
+                if path is None:
+                    path = self.render_chunk(self.current_text[start:end])
+                if self._interrupt.is_set():
+                    return
+                words = [(match.start(), match.end() - match.start())
+                         for match in _WORD.finditer(self.current_text, start, end)]
+                duration = _wav_duration(path)
+                if self._last_chunk_end is not None:
+                    gap = time.perf_counter() - self._last_chunk_end
+                    self.gaps.append(gap)
+                    metrics.observe("speechease_tts_chunk_gap_seconds", gap, **self.metrics_labels)
+                self.player.start(path)
+                started = time.perf_counter()
+                if words:
+                    self._emit_word(*words[0])
+                self._prefetch(self.current_chunk)
+                self._follow_playback(words, start, end, duration, started)
+                self.player.wait()
+                self._last_chunk_end = None if self._interrupt.is_set() else time.perf_counter()
+            else:
+                text = self.current_text[start:end]
+                def speak_chunk(engine):
+                    engine.say(text)
+                    self._saying = True
+                    try:
+                        engine.runAndWait()
+                    finally:
+                        self._saying = False
+                if self._lease is not None:
+                    # Pool jobs run in a worker process
+                    speak_chunk = functools.partial(_say, text)
+                self._run_driver(speak_chunk, interruptible=True)
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            self._set_state(IDLE)
+            return
+        if not self._interrupt.is_set():
+            self.current_chunk += 1
+
+    def _follow_playback(self, words: List[Tuple[int, int]], start: int, end: int,
+                         duration: float, started: float):
+        """Report the words of a playing chunk against the playback clock
+
+        Rendered audio carries no word timings, so each word is taken to
+        start at the same fraction of the audio's duration as of the chunk's
+        text. Words already overtaken (e.g. while prefetching) are skipped.
+        Stops when the chunk is interrupted or the player finishes.
+        """
+        length = max(1, end - start)
+
+        def due(offset: int) -> float:
+            return started + duration * (offset - start) / length
+
+        for i in range(1, len(words)):
+            offset, word_length = words[i]
+            delay = due(offset) - time.perf_counter()
+            if delay > 0 and self._interrupt.wait(delay):
+                return
+            if not self.player.is_playing():
+                return
+            if i + 1 < len(words) and due(words[i + 1][0]) <= time.perf_counter():
+                continue
+            self._emit_word(offset, word_length)
+
+    def _prefetch(self, index: int):
+        """Render chunks after `index` into the cache while chunk `index` plays"""
+        last = min(len(self.chunks), index + 1 + self.prefetch_depth)
+        for i in range(index + 1, last):
+            if self._interrupt.is_set():
+                return
+            if i in self._prefetched:
+                continue
+            # The next chunk is always worth rendering now; further ones
+            # only while audio is still playing and within the budget
+            if i > index + 1 and (not self.player.is_playing()
+                                  or self._prefetched_bytes >= self.prefetch_budget):
+                return
+            start, end = self.chunks[i]
+            path = self.render_chunk(self.current_text[start:end])
+            size = os.path.getsize(path)
+            self._prefetched[i] = (path, size)
+            self._prefetched_bytes += size
+
+    def _take_prefetched(self, index: int) -> Optional[str]:
+        entry = self._prefetched.pop(index, None)
+        if entry is None:
+            return None
+        path, size = entry
+        self._prefetched_bytes -= size
+        # The audio cache may have evicted it in the meantime
+        return path if os.path.exists(path) else None
+
+    def _discard_prefetch(self):
+        self._prefetched.clear()
+        self._prefetched_bytes = 0
+
+    def _on_started_word(self, name, location, length):
+        if not self._saying:
+            # Rendering to a file: neither progress nor interruptible, so
+            # a cached render is never cut short
+            return
+        if self._interrupt.is_set():
+            # A pause/stop/speak is waiting; cut this chunk short
+            self.engine.stop()
+            return
+        self._emit_word(self._chunk_start + location, length)
+
+    def _on_pooled_word(self, location, length):
+        # The pool worker handles interrupts itself
+        self._emit_word(self._chunk_start + location, length)
+
+    def _emit_word(self, offset: int, length: int):
+        """Report the character span being spoken to on_word_callback(offset, length)"""
+        if self._speak_requested is not None:
+            # First audio since speak()/resume(): the latency users hear
+            metrics.observe("speechease_tts_first_audio_seconds",
+                            time.perf_counter() - self._speak_requested, **self.metrics_labels)
+            self._speak_requested = None
+        if self.on_word_callback:
+            try:
+                self.on_word_callback(offset, length)
+            except Exception as e:
+                print(f"Word callback error: {e}")
+
+    def get_audio_cache(self) -> AudioCache:
+        """Return the audio cache, opening the shared default on first use"""
+        if self.audio_cache is None:
+            self.audio_cache = AudioCache()
+        return self.audio_cache
+
+    def render_chunk(self, text: str) -> str:
+        """Return a WAV file for text with the current settings, rendering on a cache miss"""
+        if threading.current_thread() is not self._thread:
+            # The key must match the settings the driver renders with
+            return self._on_engine_thread(lambda: self.render_chunk(text))
+        cache = self.get_audio_cache()
+        key = cache.make_key(text, self.voice, self.rate, self.volume)
+        path = cache.get(key)
+        if path is not None:
+            return path
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            self.save_to_file(text, temp_path)
+            return cache.put(key, temp_path)
+        finally:
+            os.remove(temp_path)
@@ -0,0 +1,382 @@
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+import metrics
+
+# Voices as reported by the worker processes
+Voice = namedtuple("Voice", "id name")
+
+
+def resolve_voice(voices, voice_name: str) -> Optional[str]:
+    """Map a voice setting ("default", "male", "female") to a driver voice id"""
+    if voice_name == "male":
+        # Try to find a male voice
+        for voice in voices:
+            if 'male' in voice.name.lower() or 'david' in voice.name.lower():
+                return voice.id
+    elif voice_name == "female":
+        # Try to find a female voice
+        for voice in voices:
+            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                return voice.id
+    # Default voice
+    return voices[0].id if voices else None
+
+
+def _worker_main(conn, driver_factory: Optional[Callable[[], Any]]):
+    """Worker process: own one speech driver and run the jobs sent over conn
+
+    Jobs arrive as (func, properties, watch) and are answered with
+    ("result", value) or ("error", exception). While a watched job runs,
+    each started word is sent as ("word", location, length), and a "stop"
+    from the parent stops the driver at that word.
+    """
+    engine = None
+    voices = []
+    try:
+        if driver_factory is None:
+            import pyttsx3
+            driver_factory = pyttsx3.init
+        engine = driver_factory()
+        voices = [Voice(voice.id, voice.name) for voice in engine.getProperty('voices') or []]
+    except Exception as e:
+        print(f"TTS Error: {e}")
+    conn.send(("voices", voices))
+    properties: Dict[str, Any] = {}
+    watching = False
+
+    def on_started_word(name, location, length):
+        if not watching:
+            return
+        conn.send(("word", location, length))
+        if conn.poll() and conn.recv() == "stop":
+            engine.stop()
+
+    if engine is not None:
+        engine.connect('started-word', on_started_word)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        if message == "stop":
+            # Sent for a word of a job that has finished since
+            continue
+        func, job_properties, watching = message
+        try:
+            if engine is None:
+                raise RuntimeError("Speech driver is not available")
+            # Workers are shared between sessions, so each job carries its
+            # own voice, rate and volume; only changed ones reach the driver
+            for name, value in job_properties.items():
+                if properties.get(name) == value:
+                    continue
+                if name == 'voice':
+                    voice_id = resolve_voice(voices, value)
+                    if voice_id is not None:
+                        engine.setProperty('voice', voice_id)
+                else:
+                    engine.setProperty(name, value)
+                properties[name] = value
+            result = ("result", func(engine))
+        except Exception as e:
+            result = ("error", e)
+        finally:
+            watching = False
+        try:
+            conn.send(result)
+        except Exception as e:
+            # The result or exception could not be pickled
+            conn.send(("error", RuntimeError(str(e))))
+
+
+class _Job:
+    def __init__(self, func: Callable, properties: Dict[str, Any],
+                 on_word: Optional[Callable] = None,
+                 interrupt: Optional[threading.Event] = None):
+        self.func = func
+        self.properties = properties
+        self.on_word = on_word
+        self.interrupt = interrupt
+        self.future: Future = Future()
+
+
+class _Worker:
+    """One pool thread feeding jobs to its own worker process"""
+
+    def __init__(self, pool: "TTSPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.conn = None
+        self.process = None
+        self.thread = threading.Thread(target=self._run, name=f"tts-pool-{index}")
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _start_process(self):
+        # spawn keeps the worker independent of any threads or speech driver
+        # state in the parent (e.g. a running Flet session)
+        context = multiprocessing.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, self.pool.driver_factory),
+            name=f"tts-pool-{self.index}", daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        _, voices = self.conn.recv()
+        return voices
+
+    def _run(self):
+        try:
+            self.pool._set_voices(self._start_process())
+        except Exception as e:
+            print(f"TTS Error: {e}")
+            self.pool._set_voices([])
+        try:
+            while True:
+                session_id, job = self.pool._next_job()
+                if job is None:
+                    return
+                self._execute(job)
+                self.pool._job_finished(session_id)
+        finally:
+            self._stop_process()
+
+    def _execute(self, job: _Job):
+        if not job.future.set_running_or_notify_cancel():
+            return
+        if job.interrupt is not None and job.interrupt.is_set():
+            # Interrupted while it was still queued
+            job.future.set_result(None)
+            return
+        try:
+            if self.process is None or not self.process.is_alive():
+                # Replace a worker process that died with a fresh driver
+                self._stop_process()
+                self._start_process()
+            watch = job.on_word is not None or job.interrupt is not None
+            self.conn.send((job.func, job.properties, watch))
+            stopping = False
+            while True:
+                message = self.conn.recv()
+                if message[0] != "word":
+                    break
+                if job.interrupt is not None and job.interrupt.is_set():
+                    if not stopping:
+                        self.conn.send("stop")
+                        stopping = True
+                elif job.on_word is not None:
+                    job.on_word(*message[1:])
+        except EOFError:
+            job.future.set_exception(RuntimeError("Speech worker process exited"))
+        except Exception as e:
+            job.future.set_exception(e)
+        else:
+            if message[0] == "result":
+                job.future.set_result(message[1])
+            else:
+                job.future.set_exception(message[1])
+
+    def _stop_process(self):
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.conn.close()
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+
+
+class PoolLease:
+    """A session's handle on a TTSPool"""
+
+    def __init__(self, pool: "TTSPool", session_id: Any):
+        self.pool = pool
+        self.session_id = session_id
+
+    def run(self, func: Callable, properties: Dict[str, Any],
+            on_word: Optional[Callable] = None,
+            interrupt: Optional[threading.Event] = None):
+        """Run func(engine) on a pooled driver and wait for its result
+
+        The job runs in a worker process, so func must be picklable (a
+        module-level function or a functools.partial of one), as must its
+        result. on_word(location, length) receives the driver's word events,
+        and setting `interrupt` stops the job at the next word (or skips it
+        if it has not started yet).
+        """
+        job = _Job(func, properties, on_word, interrupt)
+        self.pool._submit(self.session_id, job)
+        return job.future.result()
+
+    def release(self):
+        """Cancel this session's queued jobs and forget the session"""
+        self.pool._release(self.session_id)
+
+
+class TTSPool:
+    """Process-wide, bounded pool of speech drivers shared by all sessions.
+
+    pyttsx3 keeps a single engine per process, so like AudioExporter each
+    worker runs its own spawned process with one driver, and the number of
+    driver initializations and synthesis processes is fixed no matter how
+    many sessions connect. Sessions queue jobs through a PoolLease; workers
+    take the next job round-robin across sessions, skipping any session
+    that already has per_session_limit jobs running, so one busy session
+    cannot starve the others. Workers (and their processes) are started
+    when the first job is submitted or voices are requested.
+
+    Queue depth, running jobs and sessions are published as gauges through
+    the metrics module.
+    """
+
+    def __init__(self, workers: Optional[int] = None, per_session_limit: int = 1,
+                 driver_factory: Optional[Callable[[], Any]] = None):
+        self.size = workers or os.cpu_count() or 1
+        self.per_session_limit = per_session_limit
+        # Creates each worker process's driver; pyttsx3.init by default. It
+        # is sent to the worker processes, so it must be picklable.
+        self.driver_factory = driver_factory
+        self.voices = []
+        self._voices_ready = threading.Event()
+        self._cond = threading.Condition()
+        self._pending: Dict[Any, deque] = {}
+        self._running: Dict[Any, int] = {}
+        self._order: deque = deque()
+        self._closed = False
+        self._session_ids = itertools.count(1)
+        self._workers: List[_Worker] = []
+
+    def _start_workers(self):
+        # Called with self._cond held
+        if not self._workers and not self._closed:
+            self._workers = [_Worker(self, i) for i in range(self.size)]
+
+    def _set_voices(self, voices):
+        if not self._voices_ready.is_set():
+            self.voices = voices
+            self._voices_ready.set()
+
+    def get_voices(self):
+        with self._cond:
+            self._start_workers()
+            if not self._workers:
+                return self.voices
+        self._voices_ready.wait()
+        return self.voices
+
+    def lease(self, session_id: Any = None) -> PoolLease:
+        if session_id is None:
+            session_id = next(self._session_ids)
+        return PoolLease(self, session_id)
+
+    def _submit(self, session_id: Any, job: _Job):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("TTS pool is shut down")
+            self._start_workers()
+            if session_id not in self._pending:
+                self._pending[session_id] = deque()
+                self._order.append(session_id)
+            self._pending[session_id].append(job)
+            metrics.increment("speechease_tts_pool_jobs_submitted_total")
+            self._publish_metrics(session_id)
+            self._cond.notify()
+
+    def _pick(self):
+        for _ in range(len(self._order)):
+            session_id = self._order[0]
+            self._order.rotate(-1)
+            if self._pending[session_id] and self._running.get(session_id, 0) < self.per_session_limit:
+                return session_id
+        return None
+
+    def _next_job(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None, None
+                session_id = self._pick()
+                if session_id is not None:
+                    job = self._pending[session_id].popleft()
+                    self._running[session_id] = self._running.get(session_id, 0) + 1
+                    self._publish_metrics(session_id)
+                    return session_id, job
+                self._cond.wait()
+
+    def _job_finished(self, session_id: Any):
+        with self._cond:
+            metrics.increment("speechease_tts_pool_jobs_completed_total")
+            self._running[session_id] -= 1
+            if not self._running[session_id]:
+                del self._running[session_id]
+                if session_id in self._pending and not self._pending[session_id]:
+                    del self._pending[session_id]
+                    self._order.remove(session_id)
+            self._publish_metrics(session_id)
+            self._cond.notify_all()
+
+    def _release(self, session_id: Any):
+        with self._cond:
+            jobs = self._pending.pop(session_id, None)
+            if jobs is not None:
+                self._order.remove(session_id)
+                for job in jobs:
+                    job.future.cancel()
+            self._publish_metrics(session_id)
+
+    def _publish_metrics(self, session_id: Any = None):
+        """Update the pool gauges, and session_id's queue depth; needs self._cond"""
+        if not metrics.enabled():
+            return
+        metrics.set_gauge("speechease_tts_pool_workers", self.size)
+        metrics.set_gauge("speechease_tts_pool_sessions", len(self._order))
+        metrics.set_gauge("speechease_tts_pool_queue_depth",
+                          sum(len(jobs) for jobs in self._pending.values()))
+        metrics.set_gauge("speechease_tts_pool_running", sum(self._running.values()))
+        if session_id is None:
+            return
+        if session_id in self._pending:
+            metrics.set_gauge("speechease_tts_pool_session_queue_depth",
+                              len(self._pending[session_id]), session=session_id)
+        else:
+            metrics.remove_gauge("speechease_tts_pool_session_queue_depth", session=session_id)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            sessions = list(self._pending)
+            for jobs in self._pending.values():
+                for job in jobs:
+                    job.future.cancel()
+            self._pending.clear()
+            self._order.clear()
+            for session_id in sessions:
+                self._publish_metrics(session_id)
+            self._publish_metrics()
+            self._cond.notify_all()
+
+
+_shared_pool: Optional[TTSPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool(workers: Optional[int] = None) -> TTSPool:
+    """Return the process-wide pool, creating it on first use"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = TTSPool(workers)
+        return _shared_pool